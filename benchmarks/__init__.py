@@ -0,0 +1,10 @@
+"""
+py4macroのベンチマーク（asv）
+
+    pip install asv
+    asv run                        # mainブランチの最新のコミット
+    asv run HEAD^!                 # 現在のコミット
+    asv continuous main HEAD       # mainと現在のコミットを比較（遅くなった場合は表示される）
+    asv publish && asv preview     # 結果をブラウザで表示
+
+結果は`.asv/results/`に保存される。"""
@@ -0,0 +1,92 @@
+"""`data()`の時間（キャッシュがない場合とある場合）"""
+
+import py4macro
+
+from .common import DATASETS, clear_cache
+
+
+class ColdLoad:
+    """キャッシュを削除した後の読み込み（ファイルの解析を含む）"""
+
+    params = DATASETS
+    param_names = ['dataset']
+    number = 1
+    repeat = (3, 10, 20.0)
+    warmup_time = 0
+
+    def setup(self, dataset):
+        clear_cache()
+
+    def time_data(self, dataset):
+        py4macro.data(dataset)
+
+    def peakmem_data(self, dataset):
+        py4macro.data(dataset)
+
+
+class WarmLoad:
+    """キャッシュにある場合の読み込み"""
+
+    params = DATASETS
+    param_names = ['dataset']
+
+    def setup(self, dataset):
+        py4macro.data(dataset)
+
+    def time_data(self, dataset):
+        py4macro.data(dataset)
+
+
+class PwtOptions:
+    """'pwt'の列・行の選択とcompactの読み込み（キャッシュなし）"""
+
+    params = ['columns', 'countries', 'compact']
+    param_names = ['option']
+    number = 1
+    repeat = (3, 10, 20.0)
+    warmup_time = 0
+
+    kwargs = {'columns': {'columns': ['rgdpna', 'pop']},
+              'countries': {'countries': ['JPN', 'USA', 'DEU']},
+              'compact': {'compact': True}}
+
+    def setup(self, option):
+        clear_cache()
+
+    def time_data(self, option):
+        py4macro.data('pwt', **self.kwargs[option])
+
+
+class PanelQuery:
+    """'pwt'の行の選択：`panel()`の二分探索と真偽値のマスク"""
+
+    params = ['country', 'country-years', 'income_group', 'wide']
+    param_names = ['query']
+
+    def setup(self, query):
+        if not hasattr(py4macro, 'panel'):
+            raise NotImplementedError
+        self.df = py4macro.data('pwt')
+        self.panel = py4macro.panel('pwt')
+
+    def time_panel(self, query):
+        p = self.panel
+        if query == 'country':
+            p.select('JPN')
+        elif query == 'country-years':
+            p.select('JPN', years=(1990, None))
+        elif query == 'income_group':
+            p.select(years=(2000, 2019), income_group='High income')
+        else:
+            p.wide('rgdpna')
+
+    def time_mask(self, query):
+        df = self.df
+        if query == 'country':
+            df.loc[df['countrycode'] == 'JPN']
+        elif query == 'country-years':
+            df.loc[(df['countrycode'] == 'JPN') & (df['year'] >= 1990)]
+        elif query == 'income_group':
+            df.loc[(df['income_group'] == 'High income') & df['year'].between(2000, 2019)]
+        else:
+            df.pivot(index='countrycode', columns='year', values='rgdpna')
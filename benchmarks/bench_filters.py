@@ -0,0 +1,58 @@
+"""`trend()`と`cycle()`の時間"""
+
+import numpy as np
+import pandas as pd
+
+import py4macro
+
+
+def _series(n):
+    rng = np.random.default_rng(0)
+    # 10^6期の日次データはTimestampの範囲を超えるため１時間毎とする（計算には影響しない）
+    index = pd.date_range('1900-01-01', periods=n, freq='h')
+    return pd.Series(rng.standard_normal(n).cumsum(), index=index, name='y')
+
+
+class HPTrend:
+    """系列の長さ毎のHPフィルター"""
+
+    params = [100, 1_000, 10_000, 100_000, 1_000_000]
+    param_names = ['n']
+    timeout = 120
+
+    def setup(self, n):
+        self.s = _series(n)
+
+    def time_trend(self, n):
+        py4macro.trend(self.s)
+
+    def time_trend_numpy(self, n):
+        py4macro.trend(self.s, engine='numpy')
+
+    def time_trend_statsmodels(self, n):
+        py4macro.trend(self.s, engine='statsmodels')
+
+
+class PanelTrend:
+    """'pwt'の全ての国と浮動小数点数の列のHPフィルター"""
+
+    def setup(self):
+        self.df = py4macro.data('pwt')
+
+    def time_trend(self):
+        py4macro.trend(self.df, lamb=100, by='countrycode')
+
+
+class Cycle:
+    """'jpn-q'の全ての列の景気循環成分"""
+
+    params = ['hp', 'hamilton', 'bk', 'cf']
+    param_names = ['method']
+
+    def setup(self, method):
+        if not hasattr(py4macro, 'cycle'):
+            raise NotImplementedError
+        self.df = np.log(py4macro.data('jpn-q').clip(lower=1e-9))
+
+    def time_cycle(self, method):
+        py4macro.cycle(self.df, method=method)
@@ -0,0 +1,10 @@
+"""`import py4macro`の時間（新しいプロセスで計測する）"""
+
+
+def timeraw_import():
+    return "import py4macro"
+
+
+def timeraw_import_and_data():
+    # pandasなどのインポートを含む最初の`data()`の時間
+    return "import py4macro; py4macro.data('data1')"
@@ -0,0 +1,71 @@
+"""`fukyo()`と`recessions()`の時間（Agg）"""
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt   # noqa: E402
+
+import py4macro                   # noqa: E402
+
+
+def _subplots(grid):
+    """Figure and flat array of axes of a grid such as '3x3'."""
+
+    rows, cols = (int(i) for i in grid.split('x'))
+    fig, axes = plt.subplots(rows, cols, squeeze=False)
+    return fig, axes.ravel()
+
+
+class Fukyo:
+    """（行数）x（列数）の軸に`fukyo()`で塗りつぶしを追加する"""
+
+    params = ['1x1', '3x3', '6x6']
+    param_names = ['grid']
+    number = 1
+    repeat = (3, 10, 20.0)
+    warmup_time = 0
+
+    def setup(self, grid):
+        s = py4macro.data('jpn-q')['gdp']
+        self.fig, self.axes = _subplots(grid)
+        for ax in self.axes:
+            ax.plot(s.index, s)
+
+    def teardown(self, grid):
+        plt.close(self.fig)
+
+    def time_fukyo(self, grid):
+        for ax in self.axes:
+            py4macro.fukyo(ax, start=1951)
+
+    def time_fukyo_draw(self, grid):
+        for ax in self.axes:
+            py4macro.fukyo(ax, start=1951)
+        self.fig.canvas.draw()
+
+
+class Recessions:
+    """`@recessions()`を適用した関数（プロットを含む）"""
+
+    params = ['1x1', '3x3', '6x6']
+    param_names = ['grid']
+
+    def setup(self, grid):
+        s = py4macro.data('jpn-q')['gdp']
+
+        @py4macro.recessions(start=1951)
+        def plot():
+            fig, axes = _subplots(grid)
+            for ax in axes:
+                ax.plot(s.index, s)
+            return axes
+
+        self.plot = plot
+
+    def teardown(self, grid):
+        plt.close('all')
+
+    def time_recessions(self, grid):
+        self.plot()
+        plt.close('all')
@@ -0,0 +1,17 @@
+"""ベンチマークで共通に使う定数と関数"""
+
+# `data()`のデータ・セット名
+# 以前のバージョンとも比較できるように，`_registry`から取得せずに列挙する
+DATASETS = ['pwt', 'weo', 'mad', 'mad-region', 'jpn-q', 'jpn-yr', 'jpn-money',
+            'world-money', 'ex', 'inequality', 'dates', 'bigmac', 'debts',
+            'data1', 'data2', 'data3', 'data4', 'data5']
+
+
+def clear_cache():
+    """Clear the cache of `data()` (versions without a cache do nothing)."""
+
+    import py4macro
+
+    cache_clear = getattr(py4macro, 'cache_clear', None)
+    if cache_clear is not None:
+        cache_clear()
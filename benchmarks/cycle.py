@@ -0,0 +1,93 @@
+"""
+`py4macro.cycle()`と`statsmodels`（系列毎の計算）の比較
+
+    python benchmarks/cycle.py
+
+'jpn-q'の全ての列と'pwt'の全ての国（`rgdpna`，`pop`，`emp`）について，
+各フィルターの計算時間と結果の最大誤差（絶対値の最大値との比）を表示する。
+Hamiltonフィルターは`statsmodels`にないため，系列毎の`OLS`と比較する。"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import statsmodels.api as sm
+from statsmodels.tsa.filters.bk_filter import bkfilter
+from statsmodels.tsa.filters.cf_filter import cffilter
+from statsmodels.tsa.filters.hp_filter import hpfilter
+
+import py4macro
+
+
+def _hamilton_ols(y, h, p):
+    n = len(y)
+    if n - h - p + 1 < p + 1:
+        return np.full(n, np.nan)
+    X = np.column_stack([np.ones(n - h - p + 1)] + [y[p-1-i:n-h-i] for i in range(p)])
+    return np.r_[np.full(h + p - 1, np.nan), sm.OLS(y[h+p-1:], X).fit().resid]
+
+
+def _reference(y, method, annual):
+    """statsmodels (or OLS) result of one series without NaN."""
+
+    low, high, K = (2, 8, 3) if annual else (6, 32, 12)
+    if method == 'hp':
+        return hpfilter(y, lamb=100 if annual else 1600)[0] if len(y) > 2 else np.zeros(len(y))
+    if method == 'hamilton':
+        return _hamilton_ols(y, *((2, 2) if annual else (8, 4)))
+    if method == 'bk':
+        out = np.full(len(y), np.nan)
+        if len(y) > 2 * K:
+            out[K:len(y)-K] = bkfilter(y, low=low, high=high, K=K)
+        return out
+    if method == 'cf':
+        return cffilter(y, low=low, high=high)[0] if len(y) > 1 else np.full(len(y), np.nan)
+
+
+def _per_series(df, method, annual, by=None):
+    columns = [c for c in df.columns if c not in (by, 'year', 'country')]
+    groups = [df] if by is None else [g for _, g in df.groupby(by, sort=False)]
+    out = df.copy()
+    for g in groups:
+        for c in columns:
+            s = g[c].dropna()
+            out.loc[s.index, c] = _reference(s.to_numpy(dtype=float), method, annual)
+    return out[columns]
+
+
+def _py4macro(df, method, annual, by=None):
+    kwargs = dict(lamb=100, h=2, p=2, low=2, high=8, K=3) if annual else {}
+    return py4macro.cycle(df, method=method, by=by, **kwargs)
+
+
+def _timeit(func, repeat=3):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run():
+    jpn = py4macro.data('jpn-q')
+    jpn = np.log(jpn.loc[:, (jpn > 0).all()])
+    pwt = py4macro.data('pwt', columns=['rgdpna', 'pop', 'emp'])
+    cases = [('jpn-q', jpn, False, None), ('pwt', pwt, True, 'countrycode')]
+
+    rows = []
+    for name, df, annual, by in cases:
+        for method in ('hp', 'hamilton', 'bk', 'cf'):
+            t_sm, ref = _timeit(lambda: _per_series(df, method, annual, by), repeat=1)
+            t_py, res = _timeit(lambda: _py4macro(df, method, annual, by))
+            a, b = res[ref.columns].to_numpy(dtype=float), ref.to_numpy(dtype=float)
+            err = np.nanmax(np.abs(a - b)) / np.nanmax(np.abs(b))
+            rows.append([name, method, t_sm, t_py, t_sm / t_py, err])
+
+    return pd.DataFrame(rows, columns=['dataset', 'method', 'statsmodels (s)',
+                                       'py4macro (s)', 'speedup', 'max rel. error'])
+
+
+if __name__ == '__main__':
+    with pd.option_context('display.float_format', '{:.3g}'.format):
+        print(run())
@@ -2,9 +2,10 @@
 
 # https://github.com/Py4Macro/py4macro.git
 
-from .py4macro import *
-
-__all__ = ['data','trend','show','xvalues','recessions','fukyo', 'see']
+__all__ = ['data','trend','cycle','cycle_stats','show','xvalues','recessions','fukyo', 'see', 'render_many', 'cycle_phase',
+           'data_many', 'adata', 'iter_data', 'panel',
+           'set_cache', 'cache_info', 'cache_clear', 'verify_data',
+           'register_dataset', 'memory_report', 'TrendTracker']
 
 __author__ = 'Tetsu Haruyama'
 __version__ = '0.8.16'
@@ -14,11 +15,23 @@ __doc__ = """
     「Pythonで学ぶマクロ経済学 (中級＋レベル)」のためのモジュール
 
         * HPフィルターを使いトレンドを抽出する`trend()`関数
+        * HP，Hamilton，Baxter-King，Christiano-Fitzgeraldフィルターで景気循環成分を返す`cycle()`関数
+        * 景気循環のモーメント（標準偏差，自己相関，リード・ラグの相関）を返す`cycle_stats()`関数
+        * 片側HPフィルターのトレンドを１期ずつ更新する`TrendTracker`クラス
         * `DataFrame`を全て表示する`show()`関数
         * `n`個の浮動小数点数から構成されるリストを返す`xvalues()`関数
         * オブジェクトの属性（`_`もしくは`__`が付いた属性以外）を表示する`see()`関数
         * 後退期間にグレーの塗りつぶしを追加する`fukyo()`関数
         * 後退期間にグレーの塗りつぶしを追加する`recessions()`デコレーター
+        * 後退期間を塗りつぶした複数の図をまとめて保存する`render_many()`関数
+        * 時点毎に景気循環の局面（拡張期・後退期）を返す`cycle_phase()`関数
+        * 複数のデータ・セットを同時に読み込む`data_many()`関数と`adata()`関数（asyncio）
+        * データ・セットを国毎・一定の行数毎に読み込む`iter_data()`関数
+        * 国と年で索引したパネル・データを返す`panel()`関数
+        * `data()`のキャッシュを設定する`set_cache()`，`cache_info()`，`cache_clear()`関数
+        * 同梱データがマニフェストと一致するかを確認する`verify_data()`関数
+        * `data()`で読み込むデータ・セットを登録する`register_dataset()`関数
+        * `data(compact=True)`で節約されるメモリを表示する`memory_report()`関数
         * データ・セット
             * Penn World Tables 11.0
             * IMF World Economic Outlook 2024
@@ -31,4 +44,36 @@ __doc__ = """
             * 景気循環日付と拡張・後退期間
             * Big Mac インデックス
             * 政府負債に関する長期時系列データ
+            * 所得・資産の分布とジニ係数
             * 『経済学のためのPython入門』用のデータ"""
+
+
+# ===== Lazy import ===========================================================
+# `import py4macro`の時点ではpandasやnumpyをインポートしない。
+# `py4macro.data`などの属性に最初にアクセスした際に`py4macro.py`を読み込む。
+# `xvalues()`と`see()`はpandasを必要としない`_tools.py`から読み込む。
+# 目安：`import py4macro`は10ミリ秒以内（pandasを含めると約0.7秒）
+
+from importlib import import_module
+
+_LIGHT = ('xvalues', 'see')
+
+
+def __getattr__(name):
+
+    if name.startswith('__'):
+        raise AttributeError(f"module 'py4macro' has no attribute '{name}'")
+
+    module = import_module('._tools' if name in _LIGHT else '.py4macro', __name__)
+
+    try:
+        value = getattr(module, name)
+    except AttributeError:
+        raise AttributeError(f"module 'py4macro' has no attribute '{name}'") from None
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,492 @@
+"""
+`data()`が読み込んだDataFrameのキャッシュ
+
+* メモリ上のLRUキャッシュ（サイズの上限付き）
+* ディスク上のParquetスナップショット（オプトイン，`pyarrow`が必要）
+* プロセス間で共有するメモリ・マップしたArrowファイル（オプトイン，`pyarrow`が必要，`_shared.py`）
+* 同じデータを複数のスレッドが同時に要求した場合，読み込みは１回だけ行われ，
+  他のスレッドはその結果を待つ（single-flight）
+
+キャッシュに保存されたDataFrameはそのまま返さず，Copy-on-Writeのコピーを返す。
+そのため，返されたDataFrameを変更してもキャッシュの中身は変わらない。"""
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import pandas as pd
+
+from . import _shared
+
+# ===== Settings ==============================================================
+
+_settings = {
+    # メモリ上のキャッシュの上限（バイト）。0の場合はキャッシュしない。
+    'maxsize': 256 * 1024**2,
+    # ディスク・キャッシュを使うかどうか（環境変数`PY4MACRO_DISK_CACHE=1`でも有効になる）
+    'disk': os.environ.get('PY4MACRO_DISK_CACHE', '0').lower() in ('1', 'true', 'yes'),
+    # ディスク・キャッシュのフォルダ
+    'directory': os.environ.get(
+        'PY4MACRO_CACHE_DIR',
+        os.path.join(os.path.expanduser('~'), '.cache', 'py4macro')),
+    # 元ファイルが変更されたかの判定方法：'mtime'（サイズと更新時刻）もしくは'hash'（SHA-256）
+    'validate': 'mtime',
+    # プロセス間でメモリ・マップしたファイルを共有するかどうか（環境変数`PY4MACRO_SHARED=1`でも有効になる）
+    'shared': os.environ.get('PY4MACRO_SHARED', '0').lower() in ('1', 'true', 'yes'),
+    # 共有ファイルのフォルダ（None：`/dev/shm/py4macro-<uid>`もしくはディスク・キャッシュの`shared`）
+    'shared_directory': os.environ.get('PY4MACRO_SHARED_DIR'),
+}
+
+
+def _cow_enabled():
+    """Return True if shallow copies are safe (pandas Copy-on-Write is active)."""
+
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    try:
+        return pd.get_option('mode.copy_on_write') is True
+    except KeyError:
+        return False
+
+
+def _copy(df):
+    """
+    Return a copy of `df` which can be modified without touching the cache.
+    With Copy-on-Write this is a lazy (zero-cost) copy."""
+
+    return df.copy(deep=not _cow_enabled())
+
+
+def _nbytes(df):
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+# ===== In-memory LRU cache ===================================================
+
+
+class _LRUCache:
+    """Thread-safe LRU cache of DataFrames bounded by their total memory size."""
+
+    def __init__(self):
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.currsize = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            try:
+                df, nbytes = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data[key] = (df, nbytes)
+            self.hits += 1
+            return df
+
+    def peek(self, key):
+        """Return the cached frame without updating the statistics or the order."""
+
+        with self._lock:
+            item = self._data.get(key)
+        return None if item is None else item[0]
+
+    def put(self, key, df):
+        nbytes = _nbytes(df)
+        with self._lock:
+            if key in self._data:
+                self.currsize -= self._data.pop(key)[1]
+            if nbytes > _settings['maxsize']:
+                return
+            self._data[key] = (df, nbytes)
+            self.currsize += nbytes
+            self._evict()
+
+    def shrink(self):
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+        while self.currsize > _settings['maxsize']:
+            _, (_, old_nbytes) = self._data.popitem(last=False)
+            self.currsize -= old_nbytes
+
+    def discard(self, name):
+        """Remove the frames of the dataset `name`."""
+
+        with self._lock:
+            for key in [k for k in self._data if k[0][0] == name]:
+                self.currsize -= self._data.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.currsize = 0
+            self.hits = 0
+            self.misses = 0
+
+    def keys(self):
+        with self._lock:
+            return list(self._data)
+
+
+_memory = _LRUCache()
+
+
+# ===== On-disk snapshots =====================================================
+
+
+def _source_signature(path):
+    """
+    Signature of the source file used to invalidate snapshots.
+    'mtime': (size, mtime in ns), 'hash': SHA-256 of the file contents."""
+
+    if _settings['validate'] == 'hash':
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024**2), b''):
+                h.update(block)
+        return h.hexdigest()
+
+    st = os.stat(path)
+    return f'{st.st_size}-{st.st_mtime_ns}'
+
+
+def _snapshot_path(key, signature, directory=None, suffix='.parquet'):
+    """
+    return:
+        '<directory>/<dataset>-<digest of key>-<digest of signature><suffix>'
+        (the files of older versions of the source share the prefix)"""
+
+    name = key[0]
+    key_digest = hashlib.sha256(repr(key).encode()).hexdigest()[:16]
+    signature_digest = hashlib.sha256(signature.encode()).hexdigest()[:8]
+    return os.path.join(directory or _settings['directory'],
+                        f'{name}-{key_digest}-{signature_digest}{suffix}')
+
+
+def _remove_stale(path):
+    """Remove the files of the same key as `path` written for other versions of the source."""
+
+    directory, name = os.path.split(path)
+    prefix, suffix = name.rsplit('-', 1)[0] + '-', os.path.splitext(name)[1]
+    try:
+        stale = [f for f in os.listdir(directory)
+                 if f.startswith(prefix) and f.endswith(suffix) and (f != name)]
+    except OSError:
+        return
+    for f in stale:
+        try:
+            os.remove(os.path.join(directory, f))
+        except OSError:
+            pass
+
+
+def _remove_files(name_pattern):
+    """
+    Remove the snapshots and shared files of the datasets matching the
+    regular expression `name_pattern` (other files in the folders are kept)."""
+
+    pattern = re.compile(f'({name_pattern})-[0-9a-f]{{16}}-[0-9a-f]{{8}}\\.(parquet|arrow)')
+    for directory in (_settings['directory'], _shared_directory()):
+        if not os.path.isdir(directory):
+            continue
+        for f in os.listdir(directory):
+            if pattern.fullmatch(f):
+                try:
+                    os.remove(os.path.join(directory, f))
+                except OSError:
+                    pass
+
+
+def _read_snapshot(path):
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path)
+    except Exception:
+        # 壊れたスナップショットは作り直す
+        return None
+
+
+def _write_snapshot(path, df):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        df.to_parquet(tmp)
+        os.replace(tmp, path)
+        _remove_stale(path)
+    except ImportError:
+        # pyarrowがインストールされていない場合はディスク・キャッシュを使わない
+        _settings['disk'] = False
+    except OSError:
+        pass
+
+
+# ===== Shared memory-mapped frames ===========================================
+
+
+def _shared_directory():
+    return _settings['shared_directory'] or _shared.default_directory(_settings['directory'])
+
+
+def _attach_shared(path):
+    try:
+        return _shared.attach(path)
+    except ImportError:
+        _settings['shared'] = False
+        return None
+
+
+def _publish_shared(path, df):
+    try:
+        mapped = _shared.publish(path, df)
+        _remove_stale(path)
+        return mapped
+    except ImportError:
+        # pyarrowがインストールされていない場合は共有しない
+        _settings['shared'] = False
+    except OSError:
+        pass
+    return df
+
+
+# ===== Single-flight loading =================================================
+
+# 読み込み中のキー -> 結果を受け取るFuture
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _single_flight(full_key, load):
+    """
+    Call `load()` unless another thread is already loading `full_key`,
+    in which case wait for its result (or exception) instead."""
+
+    with _inflight_lock:
+        future = _inflight.get(full_key)
+        leader = future is None
+        if leader:
+            # 他のスレッドが読み込みを終えた直後の場合はキャッシュにある
+            df = _memory.peek(full_key)
+            if df is not None:
+                return df
+            future = _inflight[full_key] = Future()
+
+    if not leader:
+        return future.result()
+
+    try:
+        df = load()
+        future.set_result(df)
+        return df
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[full_key]
+
+
+# ===== Values derived from a source file ======================================
+
+# (key, source, signature) -> 値（圧縮したデータ型の計画など，小さいもののみ）
+_derived = {}
+_derived_lock = threading.Lock()
+
+
+def derived(key, source, build):
+    """
+    parameters:
+        key: hashable tuple; `key[0]` is the dataset name
+        source: path of the file the value is derived from
+        build: function with no arguments returning the value
+
+    return:
+        the value of `build()`, computed once per version of `source`"""
+
+    full_key = (key, source, _source_signature(source))
+    with _derived_lock:
+        if full_key in _derived:
+            return _derived[full_key]
+    value = build()
+    with _derived_lock:
+        return _derived.setdefault(full_key, value)
+
+
+# ===== Entry point used by data() ============================================
+
+
+def persistent():
+    """True if frames are saved outside the process (disk snapshots or shared files)."""
+
+    return _settings['disk'] or _settings['shared']
+
+
+def cached(key, source, reader, persist=True):
+    """
+    parameters:
+        key: hashable tuple identifying the frame; `key[0]` is the dataset name
+        source: path of the file `reader` parses (used for invalidation)
+        reader: function with no arguments returning the DataFrame
+        persist: if False, the frame is only kept in memory (no disk snapshot
+                 nor shared file); used for frames which are a part of a dataset
+
+    return:
+        a copy of the cached DataFrame (calls `reader` on a miss; concurrent
+        misses of the same key share one call)"""
+
+    signature = _source_signature(source)
+    full_key = (key, source, signature)
+
+    df = _memory.get(full_key) if _settings['maxsize'] > 0 else None
+    if df is not None:
+        return _copy(df)
+
+    def load():
+        # 他のプロセスが共有したファイル -> ディスクのスナップショット -> reader()の順
+        shared = (_snapshot_path(key, signature, _shared_directory(), '.arrow')
+                  if persist and _settings['shared'] else None)
+        df = _attach_shared(shared) if shared is not None else None
+
+        if df is None:
+            snapshot = _snapshot_path(key, signature) if persist and _settings['disk'] else None
+            if snapshot is not None:
+                df = _read_snapshot(snapshot)
+
+            if df is None:
+                df = reader()
+                if snapshot is not None:
+                    _write_snapshot(snapshot, df)
+
+            if shared is not None:
+                df = _publish_shared(shared, df)
+
+        if _settings['maxsize'] > 0:
+            _memory.put(full_key, df)
+        return df
+
+    return _copy(_single_flight(full_key, load))
+
+
+def lookup(key, source):
+    """
+    Return the cached DataFrame for `key` without parsing (None on a miss).
+    The returned frame must not be modified."""
+
+    return _memory.peek((key, source, _source_signature(source)))
+
+
+def forget(name):
+    """
+    Remove everything cached for the dataset `name` (frames in memory, derived
+    values, disk snapshots and shared files), e.g. when it is registered again."""
+
+    _memory.discard(name)
+    with _derived_lock:
+        for key in [k for k in _derived if k[0][0] == name]:
+            del _derived[key]
+
+    _remove_files(re.escape(name))
+
+
+# ===== Public functions ======================================================
+
+
+def set_cache(maxsize=None, disk=None, directory=None, validate=None, shared=None,
+              shared_directory=None):
+    """|
+       | `data()`のキャッシュの設定を変更する（`None`の引数は変更しない）
+       |
+       | 引数：
+       |     maxsize: メモリ上のキャッシュの上限（MB，デフォルト：256）。0はキャッシュしない。
+       |     disk: Trueの場合，ディスク上にParquetのスナップショットを保存する（デフォルト：False）
+       |           * データ・セット全体のみを保存し，columns，countries，yearsはそれから選択する
+       |           * `pyarrow`が必要
+       |           * 環境変数`PY4MACRO_DISK_CACHE=1`でも有効になる
+       |     directory: ディスク・キャッシュのフォルダ（デフォルト：~/.cache/py4macro）
+       |           * 環境変数`PY4MACRO_CACHE_DIR`でも指定できる
+       |     validate: 元データが変更されたかの判定方法
+       |           'mtime': ファイルのサイズと更新時刻（デフォルト）
+       |           'hash': ファイルのSHA-256
+       |     shared: Trueの場合，読み込んだデータをメモリ・マップしたArrowファイルとして
+       |           プロセス間で共有する（デフォルト：False）
+       |           * 最初のプロセスがファイルを作成し，他のプロセスはコピーせずに使う
+       |             （プロセスの数が増えてもデータのメモリは増えない）
+       |           * データ・セット全体のみを共有し，columns，countries，yearsはそれから選択する
+       |           * `pyarrow`が必要（ゼロ・コピーにはpandasのCopy-on-Writeも必要）
+       |           * 環境変数`PY4MACRO_SHARED=1`でも有効になる（この関数も環境変数を設定するため，
+       |             後で起動する子プロセスにも引き継がれる）
+       |     shared_directory: 共有ファイルのフォルダ
+       |           （デフォルト：`/dev/shm/py4macro-<uid>`，ない場合は`directory`の`shared`）
+       |           * 所有者が異なる，もしくは他のユーザーが書き込めるフォルダは使わない
+       |           * 環境変数`PY4MACRO_SHARED_DIR`でも指定できる
+       |
+       | 戻り値：
+       |     なし
+       |
+       | 例１：py4macro.set_cache(disk=True)
+       |
+       | 例２：py4macro.set_cache(shared=True)
+       |       with ProcessPoolExecutor() as ex:
+       |           ex.map(work, countries)    # work()の中でpy4macro.data('pwt')を使う"""
+
+    if validate not in (None, 'mtime', 'hash'):
+        raise ValueError("validateには'mtime'もしくは'hash'を指定してください。")
+
+    if maxsize is not None:
+        _settings['maxsize'] = int(maxsize * 1024**2)
+        _memory.shrink()
+    if disk is not None:
+        _settings['disk'] = bool(disk)
+    if directory is not None:
+        _settings['directory'] = os.path.expanduser(directory)
+    if validate is not None:
+        _settings['validate'] = validate
+    if shared is not None:
+        _settings['shared'] = bool(shared)
+        os.environ['PY4MACRO_SHARED'] = '1' if shared else '0'
+    if shared_directory is not None:
+        _settings['shared_directory'] = os.path.expanduser(shared_directory)
+        os.environ['PY4MACRO_SHARED_DIR'] = _settings['shared_directory']
+
+
+def cache_info():
+    """|
+       | `data()`のキャッシュの状態を返す
+       |
+       | 戻り値：
+       |     辞書（hits, misses, currsize (MB), maxsize (MB), datasets, disk, directory,
+       |           shared, shared_directory）"""
+
+    return {'hits': _memory.hits,
+            'misses': _memory.misses,
+            'currsize': _memory.currsize / 1024**2,
+            'maxsize': _settings['maxsize'] / 1024**2,
+            'datasets': [k[0][0] for k in _memory.keys()],
+            'disk': _settings['disk'],
+            'directory': _settings['directory'],
+            'shared': _settings['shared'],
+            'shared_directory': _shared_directory()}
+
+
+def cache_clear(disk=False):
+    """|
+       | `data()`のキャッシュを削除する
+       |
+       | 引数：
+       |     disk: Trueの場合，ディスク上のスナップショットと共有ファイルも削除する（デフォルト：False）
+       |         * `<データ・セット名>-<16桁>-<8桁>.parquet`（`.arrow`）のファイルのみを削除し，
+       |           同じフォルダにある他のファイルは削除しない
+       |         * 共有ファイルを使っているプロセスはそのまま使い続けられる（Windows以外）"""
+
+    _memory.clear()
+    with _derived_lock:
+        _derived.clear()
+
+    if disk:
+        _remove_files('.+')
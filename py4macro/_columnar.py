@@ -0,0 +1,173 @@
+"""
+同梱データの列指向のファイル（Feather，zstd圧縮）
+
+CSVの読み込み時間の大部分はbz2の解凍である（`pwt`では約1.3秒のうち約1.1秒）。
+パッケージの作成時（`setup.py`の`build_py`）に各データ・セットを`data()`が返す
+DataFrameのまま（`read_csv()`の引数と後処理を適用した後のデータ型で）Featherの
+ファイルに変換し，CSVと同じフォルダに置く。
+
+* `data()`は変換したファイルがあればそれを読み込み（`pwt`で約25ミリ秒），
+  なければCSVを読み込む
+* 変換したファイルには元のCSVのSHA-256と作成時のpandasのメジャー・バージョンを記録し，
+  CSVと一致しない場合と，pandasのメジャー・バージョンが異なる場合
+  （文字列や日時のデータ型が異なる）は使わない
+* 作成時に変換したファイルとCSVから読み込んだDataFrameが一致することを
+  `pd.testing.assert_frame_equal()`で確認し，一致しない場合はファイルを作成しない
+* `pyarrow`がない場合はCSVを読み込む"""
+
+import functools
+import importlib.util
+import os
+
+from ._manifest import _sha256
+
+SUFFIX = '.feather'
+COMPRESSION = 'zstd'
+_SOURCE_KEY = b'py4macro_source_sha256'
+_PANDAS_KEY = b'py4macro_pandas_major'
+
+
+def _pandas_major():
+    import pandas as pd
+
+    return pd.__version__.split('.')[0]
+
+
+def path_for(csv_path):
+    """
+    '.../pwt_data.csv.bz2' -> '.../pwt_data.feather'
+    (`csv_path` itself if it is not a bz2-compressed CSV file)"""
+
+    if not csv_path.endswith('.csv.bz2'):
+        return csv_path
+    return csv_path[:-len('.csv.bz2')] + SUFFIX
+
+
+@functools.lru_cache(maxsize=None)
+def _available():
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+@functools.lru_cache(maxsize=64)
+def _matches(path, mtime_ns, csv_path, csv_size, csv_mtime_ns):
+    """
+    True if the file at `path` was converted from the current `csv_path`
+    with the same major version of pandas."""
+
+    import pyarrow as pa
+    import pyarrow.ipc
+
+    try:
+        with pa.memory_map(path, 'r') as source:
+            metadata = pa.ipc.open_file(source).schema.metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return False
+    return ((metadata.get(_PANDAS_KEY, b'').decode() == _pandas_major())
+            and (metadata.get(_SOURCE_KEY, b'').decode() == _sha256(csv_path)))
+
+
+def find(csv_path):
+    """
+    return:
+        path of the converted file of `csv_path` (None if it does not exist,
+        is out of date or pyarrow is not installed)"""
+
+    path = path_for(csv_path)
+    if (path == csv_path) or (not os.path.exists(path)) or (not _available()):
+        return None
+    st = os.stat(csv_path)
+    if _matches(path, os.stat(path).st_mtime_ns, csv_path, st.st_size, st.st_mtime_ns):
+        return path
+    return None
+
+
+def columns(path):
+    """
+    return:
+        (columns, index_columns) of the DataFrame stored in `path`"""
+
+    import pyarrow as pa
+    import pyarrow.ipc
+
+    with pa.memory_map(path, 'r') as source:
+        schema = pa.ipc.open_file(source).schema
+    index = [c for c in schema.pandas_metadata['index_columns'] if isinstance(c, str)]
+    return [c for c in schema.names if c not in index], index
+
+
+def read(path, usecols=None):
+    """
+    parameters:
+        path: converted file
+        usecols: set of columns to read (None: all columns); the index is always read
+
+    return:
+        DataFrame"""
+
+    import pyarrow.feather
+
+    if usecols is None:
+        return pyarrow.feather.read_table(path).to_pandas()
+
+    names, index = columns(path)
+    wanted = [c for c in names if c in usecols] + index
+    return pyarrow.feather.read_table(path, columns=wanted).to_pandas()
+
+
+def write(df, path, csv_path):
+    """Write `df` to `path` recording the SHA-256 of `csv_path` and the pandas version."""
+
+    import pyarrow as pa
+    import pyarrow.feather
+
+    table = pa.Table.from_pandas(df)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_SOURCE_KEY] = _sha256(csv_path).encode()
+    metadata[_PANDAS_KEY] = _pandas_major().encode()
+    table = table.replace_schema_metadata(metadata)
+
+    tmp = f'{path}.{os.getpid()}.tmp'
+    pyarrow.feather.write_feather(table, tmp, compression=COMPRESSION)
+    os.replace(tmp, path)
+
+
+# ===== Building ==============================================================
+
+
+def build(out_dir, verbose=True):
+    """
+    Convert the bundled datasets to Feather files in `out_dir` (used by `setup.py`).
+
+    Each file is read back and compared with the DataFrame parsed from the CSV
+    (`assert_frame_equal(check_exact=True)`); files which differ are removed.
+
+    return:
+        list of the names of the datasets which were converted"""
+
+    import pandas as pd
+
+    from . import py4macro
+
+    converted = []
+    for name, spec in py4macro._BUILTIN.items():
+        csv_path = py4macro._find_full_file_path(py4macro._get_path(py4macro.__file__), spec.file)
+        if path_for(csv_path) == csv_path:
+            continue
+        path = os.path.join(out_dir, os.path.basename(path_for(csv_path)))
+
+        df = py4macro._parse_csv(spec, csv_path)
+        write(df, path, csv_path)
+        try:
+            pd.testing.assert_frame_equal(df, read(path), check_exact=True,
+                                          check_index_type=True, check_column_type=True)
+        except AssertionError as e:
+            os.remove(path)
+            if verbose:
+                print(f'{name}: the Feather file differs from the CSV and is not used\n{e}')
+            continue
+
+        converted.append(name)
+        if verbose:
+            print(f'{name}: {os.path.basename(path)} ({os.path.getsize(path) / 1024:.0f} kB)')
+
+    return converted
@@ -0,0 +1,193 @@
+"""
+景気循環成分を抽出するフィルター（`cycle()`で使う）
+
+    * 'hp': Hodrick-Prescottフィルター（元の系列からトレンドを引いた値）
+    * 'hamilton': Hamilton (2018)の回帰フィルター
+    * 'bk': Baxter-King (1999)のバンドパス・フィルター
+    * 'cf': Christiano-Fitzgerald (2003)のバンドパス・フィルター（非対称，全標本）
+
+各フィルターは(n, k)の行列の各列（観測値の数が同じk個の系列）をまとめて計算する。
+  * Hamilton：k個の回帰をQR分解でまとめて解く（バッチ最小二乗法）
+  * BK：対称な移動平均（重みとの畳み込み）を行列として一度に計算する
+  * CF：(n, n)の重み行列を(n, 低域, 高域)毎にキャッシュし，行列積で計算する
+
+計算できない期間（HamiltonとBKの両端）はNaNとなる。"""
+
+import functools
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from . import _hp
+
+
+# ===== Filters ===============================================================
+
+
+def hp(y, lamb=1600, engine=None):
+    """Cycle of the HP filter: y - trend."""
+
+    y = np.asarray(y, dtype=float)
+    return y - _hp.hp_trend(y, lamb, engine)
+
+
+def hamilton(y, h=8, p=4):
+    """
+    Hamilton (2018) filter: the residual of the regression of y_{t+h} on a
+    constant and y_t, y_{t-1}, ..., y_{t-p+1}.
+
+    parameters:
+        y: (n,) or (n, k) array without NaN
+        h: horizon (8 for quarterly data, 2 for annual data)
+        p: number of lags
+
+    return:
+        array with the same shape as `y` (the first h+p-1 rows are NaN)"""
+
+    y = np.asarray(y, dtype=float)
+    y2 = y.reshape(len(y), -1)
+    n, k = y2.shape
+    m = n - h - p + 1
+    out = np.full(y2.shape, np.nan)
+
+    if m < p + 1:
+        return out.reshape(y.shape)
+
+    # X[j]は系列jの(m, p+1)の説明変数の行列（定数項とラグ）
+    lags = sliding_window_view(y2[:n-h], p, axis=0)[:, :, ::-1]   # (m, k, p)
+    X = np.concatenate([np.ones((k, m, 1)), lags.transpose(1, 0, 2)], axis=2)
+    target = y2[h+p-1:].T[:, :, None]                              # (k, m, 1)
+
+    q, r = np.linalg.qr(X)
+    beta = np.linalg.solve(r, q.transpose(0, 2, 1) @ target)
+    out[h+p-1:] = (target - X @ beta)[:, :, 0].T
+
+    return out.reshape(y.shape)
+
+
+def _bk_weights(low, high, K):
+    """Symmetric weights of the Baxter-King filter (they sum to zero)."""
+
+    omega_1 = 2.0 * np.pi / high
+    omega_2 = 2.0 * np.pi / low
+    j = np.arange(1, K + 1)
+    w = (np.sin(omega_2 * j) - np.sin(omega_1 * j)) / (np.pi * j)
+    weights = np.r_[w[::-1], (omega_2 - omega_1) / np.pi, w]
+    return weights - weights.mean()
+
+
+def baxter_king(y, low=6, high=32, K=12):
+    """
+    Baxter-King band-pass filter.
+
+    parameters:
+        y: (n,) or (n, k) array without NaN
+        low, high: periodicities of the band (6 and 32 for quarterly data)
+        K: lead-lag length of the moving average
+
+    return:
+        array with the same shape as `y` (the first and last K rows are NaN)"""
+
+    y = np.asarray(y, dtype=float)
+    out = np.full(y.shape, np.nan)
+
+    if len(y) <= 2 * K:
+        return out
+
+    out[K:len(y)-K] = sliding_window_view(y, 2 * K + 1, axis=0) @ _bk_weights(low, high, K)
+    return out
+
+
+@functools.lru_cache(maxsize=32)
+def _cf_matrix(n, low, high):
+    """(n, n) weight matrix W of the Christiano-Fitzgerald filter (cycle = W @ y)."""
+
+    a = 2.0 * np.pi / high
+    b = 2.0 * np.pi / low
+    j = np.arange(1, n + 1)
+    B = np.r_[(b - a) / np.pi, (np.sin(b * j) - np.sin(a * j)) / (np.pi * j)]
+    csum = np.cumsum(B[1:])     # csum[m-1] = B[1] + ... + B[m]
+
+    def partial_sum(m):
+        return csum[m-1] if m > 0 else 0.0
+
+    W = np.zeros((n, n))
+    for i in range(n):
+        lead = max(n - i - 2, 0)    # y[i+1],...,y[n-2]の重みB[1],...,B[lead]
+        lag = max(i - 1, 0)         # y[i-1],...,y[1]の重みB[1],...,B[lag]
+        W[i, i] += B[0]
+        W[i, i+1:i+1+lead] += B[1:1+lead]
+        W[i, i-lag:i] += B[1:1+lag][::-1]
+        end = -0.5 * B[0] - partial_sum(lead)
+        W[i, n-1] += end
+        W[i, 0] += -B[0] - partial_sum(lead) - partial_sum(lag) - end
+
+    W.flags.writeable = False
+    return W
+
+
+def christiano_fitzgerald(y, low=6, high=32, drift=True):
+    """
+    Christiano-Fitzgerald asymmetric full-sample band-pass filter.
+
+    parameters:
+        y: (n,) or (n, k) array without NaN
+        low, high: periodicities of the band (6 and 32 for quarterly data)
+        drift: if True, remove the drift (y[-1] - y[0])/(n - 1) first
+
+    return:
+        array with the same shape as `y`"""
+
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+
+    if n < 2:
+        return np.full(y.shape, np.nan)
+
+    if drift:
+        t = np.arange(n) if y.ndim == 1 else np.arange(n)[:, None]
+        y = y - t * (y[-1] - y[0]) / (n - 1.0)
+
+    return _cf_matrix(n, float(low), float(high)) @ y
+
+
+# ===== Many series ===========================================================
+
+
+def cycle_panel(x, positions, func, out=None):
+    """
+    Apply `func` to the columns of `x` for each group of rows.
+
+    NaN and ±inf are dropped from each series first. Series with the same number of
+    observations are stacked into one matrix and filtered by one call of `func`.
+
+    parameters:
+        x: (rows, k) array
+        positions: list of integer arrays, the rows of each group in time order
+        func: function mapping an (n, m) array to an (n, m) array
+        out: (rows, k) array to write the results into; a new array filled
+             with NaN if None
+
+    return:
+        `out`"""
+
+    if out is None:
+        out = np.full(x.shape, np.nan)
+
+    groups = {}
+    for p in positions:
+        block = x[p]
+        for j in range(x.shape[1]):
+            valid = np.isfinite(block[:, j])
+            rows = p[valid]
+            groups.setdefault(len(rows), []).append((rows, j))
+
+    for n, targets in groups.items():
+        if n == 0:
+            continue
+        y = np.column_stack([x[rows, j] for rows, j in targets])
+        result = func(y)
+        for i, (rows, j) in enumerate(targets):
+            out[rows, j] = result[:, i]
+
+    return out
@@ -0,0 +1,274 @@
+"""
+`data(<データ・セット名>, description=1)`で表示する変数の定義
+
+`py4macro.py`を最初にインポートする際に読み込まれる。"""
+
+
+jpn_yr_definitions = """
+    | `gdp`:          国内総生産（支出側GDP）
+    | `consumption`:  消費
+    | `investment`:   投資
+    | `government`:   政府支出
+    | `exports`:      輸出
+    | `imports`:      輸入
+    | `gdp_gap`:      GDPギャップ
+    | `deflator`:     GDPデフレーター
+    | `inflation`:    インフレ率
+    | `unemployment_rate`: 失業率
+    | `employed`:     就業者数
+    | `population`:   人口
+    | `gov_debt`:     政府負債
+    | `gov_net_debt`: 政府純負債
+    |
+    | * 年次データ（暦年）
+    |
+    | ＜出典＞
+    | GDPと各需要項目
+    |    * 1994年~
+    |        * 実額、暦年
+    |        * 連鎖価格
+    |        * 参照年：2015暦年（平成27年）
+    |        * 単位：10億円
+    |        * 国民経済計算（GDP統計）
+    |    * 1980年~1993年
+    |        * 実額、暦年
+    |        * 2015年（平成27年）基準支出側GDP系列簡易遡及（参考系列であり上のデータと接続可能）
+    |        * 単位：10億円
+    |        * 国民経済計算（GDP統計）
+    |
+    | GDPギャップ
+    |   * 単位：％
+    |   * GDPの潜在GDPからの乖離
+    |   * IMF World Economic Outlook
+    |
+    | GDPデフレーター
+    |   * IMF World Economic Outlook
+    |
+    | インフレ率
+    |   * 単位：％
+    |   * 年平均
+    |   * IMF World Economic Outlook
+    |
+    | 失業率
+    |   * 単位：％
+    |   * IMF World Economic Outlook
+    |
+    | 就業者数
+    |   * 単位：万人
+    |   * IMF World Economic Outlook
+    |
+    | 人口
+    |   * 単位：万人
+    |   * IMF World Economic Outlook
+    |
+    | 政府負債
+    |   * 単位：10億円
+    |   * IMF World Economic Outlook
+    |
+    | 政府純負債
+    |   * 単位：10億円
+    |   * IMF World Economic Outlook"""
+
+
+jpn_q_definitions = """
+    | `gdp`:         国内総生産（GDP）
+    | `consumption`: 消費
+    | `investment`:  投資
+    | `government`:  政府支出
+    | `exports`:     輸出
+    | `imports`:     輸入
+    | `capital`:     資本ストック
+    | `employed`:    就業者数
+    | `unemployed`:  失業者数
+    | `unemployment_rate`: 失業率
+    | `hours`:       労働者一人当たり月平均労働時間
+    | `total_hours`: 月平均総労働時間（`employed`X`hours`）
+    | `inflation`:   インフレ率
+    | `price`:       消費者物価指数
+    | `deflator`:    GDPデフレーター
+    |
+    | * 四半期データ
+    |
+    | ＜出典＞
+    | GDPと各需要項目
+    |    * 1994年Q1~2023年Q4
+    |        * 実額・四半期・実質季節調整系列（年換算）
+    |        * 連鎖価格
+    |        * 参照年：2015年（平成27年）
+    |        * 単位：10億円
+    |        * 国民経済計算（GDP統計）
+    |    * 1980年Q1~1993年Q4
+    |        * 実額・四半期・実質季節調整系列（年換算）
+    |        * 平成27年基準支出側GDP系列簡易遡及（参考系列であり上のデータと接続可能）
+    |        * 単位：10億円
+    |        * 国民経済計算（GDP統計）
+    |
+    | 実質資本ストック
+    |   * 1994年Q1~2023年Q4
+    |        * 平成25年基準
+    |        * 単位：10億円
+    |        * 国民経済計算（GDP統計）
+    |   * 1980年Q1~1993年Q4
+    |        * 平成25年基準遡及系列
+    |        * 単位：10億円
+    |        * 国民経済計算（GDP統計）
+    |   * 簡便的な移動平均を使い季節調整を施している
+    |
+    | 就業者数，失業者数，失業率
+    |   * 総務省「労働力調査」
+    |   * 単位：万人，％
+    |
+    | 労働者一人当たり月平均労働時間
+    |   * 厚生労働省「毎月勤労統計調査」
+    |   * 30 人以上(一般・パート)、月間実労働時間(総実労働時間)
+    |   * 2020年の平均を100に基準化
+    |
+    | インフレ率
+    |   * 景気動向指数（生鮮食品を除く総合，速報，改訂値，月次，原数値の前年同月比）から四半期平均として計算
+    |
+    | 消費者物価指数
+    |   * 2020年基準
+    |   * 「中分類指数（全国）＜時系列表＞【月次】」の四半期平均として計算
+    |   * 簡便的な移動平均を使い季節調整を施している
+    |
+    | GDPデフレーター
+    |   * 1994年Q1~2023年Q4
+    |       * 2015年（平成27年）基準
+    |       * 季節調整系列
+    |   * 1980年Q1~1993年Q4
+    |       * 2015年（平成27年）基準遡及系列
+    |       * 季節調整系列"""
+
+jpn_money_definitions = """
+    | `cpi`: 消費者物価指数
+    |   * 2015年の値を`100`
+    |   * 季節調整済み
+    | `money`: マネーストック（M1）
+    |   * 2015年の値を`100`
+    |   * 季節調整済み
+    |
+    | * 月次データ
+    | * 1955年1月〜2020年12月
+    |
+    | ＜出典＞
+    | OECD Main Economic Indicators"""
+
+world_money_definitions = """
+    | `iso`:          ISO国コード
+    | `country`:      国名
+    | `year`:         年
+    | `income_group`: 世界銀行が定義する所得グループ
+    |   * High income
+    |   * Upper Middle income
+    |   * Lower Middle income
+    |   * Low income
+    | `money`:        マネーストック（M1）
+    | `deflator`:     GDPディフレーター
+    |
+    | * 年次データ
+    |
+    | ＜注意点＞
+    | * `money`と`deflator`が10年間以上連続で欠損値がない経済（177ヵ国）のみが含まれている。
+    | * 国によって含まれるデータの`year`が異なる。
+    | * 所得グループに関する情報
+    |   https://datahelpdesk.worldbank.org/knowledgebase/articles/906519-world-bank-country-and-lending-groups
+    |
+    | ＜出典＞
+    | World Bank Development Indicators"""
+
+ex_definitions = """
+    | `real_ex_geus_%change`: 独マルク/米ドル実質為替レート変動率（％）
+    |                           * 月次，季節調整ない
+    | `real_ex_jpus_%change`: 円/米ドル実質為替レート変動率（％）
+    |                           * 月次，季節調整ない
+    | `real_ex_jpus`:         円/米ドル実質為替レート
+    |                           * 月次，季節調整ない
+    | `ex_jpus`:              円/米ドル名目為替レート
+    |                           * 月次，季節調整ない
+    | `relative_p_jpus`:      日本の一般物価水準に対しての米国の一般物価水準の比率
+    |                           * 日本のCPI分の米国のCPI
+    |                           * 2015年CPI=100
+    |                           * 月次，季節調整ない
+    |
+    | * 月次データ
+    | * 期間：1960年1月〜
+    |
+    | ＜出典＞
+    | OECD Main Economic Indicators"""
+
+dates_definitions = """
+    | `tani1`:       １つの循環における第１の谷
+    | `yama`:        １つの循環における山
+    | `tani2`:       １つの循環における第２の谷
+    | `expansion`:   拡張期の期間（単位：月）
+    |                `tani1`から`yama`までの期間
+    | `contraction`: 後退期の期間（単位：月）
+    |                `yama`から`tani2`までの期間
+    |
+    | ＜出典＞
+    | 内閣府
+    | https://www.esri.cao.go.jp/jp/stat/di/hiduke.html"""
+
+bigmac_definitions = """
+    | `year`:          年（2000年〜）
+    | `country`:       国名
+    | `iso`:           ISO国コード
+    | `currency_code`: 通貨コード
+    | `price_local`:   Big Macの価格（自国通貨単位）
+    | `exr`:           名目為替レート（自国通貨単位/米ドル）
+    | `gdppc_local`:   名目一人当たりGDP（自国通貨単位）
+    |
+    | * 年次データ
+    |
+    | ＜出典＞
+    | https://github.com/TheEconomist/big-mac-data (Copyright The Economist)"""
+
+mad_definitions = """
+    | `GDP pc`:        Real GDP per capita in 2011$
+    | `Population`:    Population, mid-year (thousands)
+    | `Regional data`: Regional GDP per capita and population estimates
+    |
+    | * `GDP pc`が欠損値の行は全て削除している。
+    |
+    | ＜出典＞
+    | Maddison Project Database 2023
+    |
+    | https://www.rug.nl/ggdc/historicaldevelopment/maddison/releases/maddison-project-database-2023
+    |
+    | Bolt, Jutta, and Jan Luiten van Zanden (2024) "Maddison-style estimates of
+    | the evolution of the world economy: A new 2023 update." Journal of Economic
+    | Surveys, pp.1-41."""
+
+debts_definitions = """
+    | `countrycode`:      ISO3国名コード
+    | `country`:          国名
+    | `year`:             年
+    | `revenue`:          Government revenue, percent of GDP
+    | `expenditure`:      Government expenditure, percent of GDP
+    | `interest_exp`:     Government interest expense, percent of GDP
+    | `prim_expenditure`: Government primary expenditure, percent of GDP
+    | `prim_balance`:     Government primary balance, percent of GDP
+    | `debt`:             Government gross debt, percent of GDP
+    | `rltir`:            Real long-term interest rate, percent
+    | `rgc`:              Real GDP growth rate, percent
+    | `GG_budg`:          sector coverage indicator for rev, exp, ie (0 for central gov't, 1 for general gov't)
+    | `GG_debt`:          sector coverage indicator for debt (0 for central gov't, 1 for general gov't)
+    |
+    | ＜出典＞
+    | Public Finances in Modern History
+    | https://www.imf.org/external/datamapper/datasets/FPP"""
+
+inequality_definitions = """
+    | `variable`:   変数
+    |   * `pre-tax_income`:  税引き前所得のシェア
+    |   * `post-tax_income`: 税引き後所得のシェア
+    |   * `female_income`:   女性の労働所得のシェア
+    |   * `wealth`:          純資産のシェア
+    |   * `gini_income`:     所得のジニ係数
+    |   * `gini_wealth`:     資産のジニ係数
+    | `percentile`: パーセンタイルのグループ（ジニ係数は欠損値）
+    |   * 例：`p0p10`は下位10％，`p90p100`は上位10％
+    | `year`:       年
+    | `value`:      値（シェアは0〜1）
+    |
+    | * `variable`と`percentile`の組み合わせ毎の縦長（long）形式"""
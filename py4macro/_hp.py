@@ -0,0 +1,411 @@
+"""
+Hodrick-Prescottフィルター
+
+トレンドτは次の連立方程式の解となる。
+
+    (I + λD'D)τ = y
+
+ここでDは２階差分の行列であり，I + λD'Dは対称な５重対角（pentadiagonal）の
+正定値行列となる。帯行列のCholesky分解（`scipy`がある場合）もしくはLDL分解
+（`numpy`のみ）を使いO(n)で解くため，`statsmodels`は必要ない。
+ただし，LDL分解と代入は要素毎のPythonのループであり（ベクトル化されていない），
+10^6期の系列では約2秒かかる（LAPACKを使う`scipy`では約0.3秒）。
+
+分解は(n, λ)毎にキャッシュされ，複数の系列（行列の列）をまとめて解くことができる。
+
+片側（one-sided，リアルタイム）HPフィルターは同じモデルの状態空間表現
+
+    y_t = τ_t + η_t,                  Var(η) = 1
+    τ_t = 2τ_{t-1} - τ_{t-2} + ε_t,   Var(ε) = 1/λ
+
+にカルマン・フィルターを適用して計算する。最初の２期の観測値で初期化する
+（散漫（diffuse）な事前分布と同じ）ため，t期の値は y_1,...,y_t に両側HPフィルターを
+適用した場合の最終期の値と一致する。"""
+
+import functools
+
+import numpy as np
+
+
+def _bands(n, lamb):
+    """
+    Bands of the symmetric matrix I + lamb*D'D.
+
+    return:
+        (diag, sub1, sub2) where sub1[i] = A[i, i-1] and sub2[i] = A[i, i-2]
+        (sub1[0], sub2[0] and sub2[1] are not used)"""
+
+    # Dの各行は[1, -2, 1]であり，D'Dの各要素はその積の和となる
+    c = (1.0, -2.0, 1.0)
+    m = n - 2
+    diag = np.zeros(n)
+    sub1 = np.zeros(n)
+    sub2 = np.zeros(n)
+    for k in range(3):
+        diag[k:m+k] += c[k] * c[k]
+    for k in range(2):
+        sub1[k+1:m+k+1] += c[k] * c[k+1]
+    sub2[2:] += c[0] * c[2]
+
+    return 1.0 + lamb * diag, lamb * sub1, lamb * sub2
+
+
+# ===== numpy engine (LDL decomposition) ======================================
+
+
+class _LDL:
+    """
+    LDL' decomposition of a symmetric pentadiagonal matrix using numpy only.
+
+    The recursions are sequential Python loops on Python floats (faster than
+    indexing numpy arrays element by element): O(n), but about 2 seconds for
+    the decomposition and one solve of 10^6 observations, compared with about
+    0.3 seconds for LAPACK (scipy). Several series of the same length are
+    solved together row by row."""
+
+    def __init__(self, n, lamb):
+        a0, a1, a2 = (a.tolist() for a in _bands(n, lamb))
+        d = [0.0] * n
+        l1 = [0.0] * n
+        l2 = [0.0] * n
+
+        d[0] = a0[0]
+        l1[1] = a1[1] / d[0]
+        d[1] = a0[1] - l1[1]**2 * d[0]
+        for i in range(2, n):
+            l2[i] = a2[i] / d[i-2]
+            l1[i] = (a1[i] - l2[i] * d[i-2] * l1[i-1]) / d[i-1]
+            d[i] = a0[i] - l2[i]**2 * d[i-2] - l1[i]**2 * d[i-1]
+
+        self.n = n
+        self.d, self.l1, self.l2 = np.array(d), np.array(l1), np.array(l2)
+        self._lists = (d, l1, l2)
+
+    def _solve_1d(self, y):
+        n = self.n
+        d, l1, l2 = self._lists
+        z = np.asarray(y, dtype=float).tolist()
+
+        # 前進代入 L z = y
+        z[1] -= l1[1] * z[0]
+        for i in range(2, n):
+            z[i] -= l1[i] * z[i-1] + l2[i] * z[i-2]
+
+        # 対角 D w = z
+        z = [zi / di for zi, di in zip(z, d)]
+
+        # 後退代入 L' x = w
+        z[n-2] -= l1[n-1] * z[n-1]
+        for i in range(n-3, -1, -1):
+            z[i] -= l1[i+1] * z[i+1] + l2[i+2] * z[i+2]
+
+        return np.array(z)
+
+    def solve(self, y):
+        if np.ndim(y) == 1:
+            return self._solve_1d(y)
+
+        n, d, l1, l2 = self.n, self.d, self.l1, self.l2
+        z = np.array(y, dtype=float)
+
+        # 前進代入 L z = y
+        z[1] -= l1[1] * z[0]
+        for i in range(2, n):
+            z[i] -= l1[i] * z[i-1] + l2[i] * z[i-2]
+
+        # 対角 D w = z
+        z /= d[:, None]
+
+        # 後退代入 L' x = w
+        z[n-2] -= l1[n-1] * z[n-1]
+        for i in range(n-3, -1, -1):
+            z[i] -= l1[i+1] * z[i+1] + l2[i+2] * z[i+2]
+
+        return z
+
+
+# ===== scipy engine (banded Cholesky decomposition) ==========================
+
+
+class _BandedCholesky:
+    """Banded Cholesky decomposition using LAPACK through `scipy.linalg`."""
+
+    def __init__(self, n, lamb):
+        from scipy.linalg import cholesky_banded
+
+        a0, a1, a2 = _bands(n, lamb)
+        # 上三角の帯行列の形式：ab[2]は対角，ab[1, 1:]とab[0, 2:]は上側の対角
+        ab = np.zeros((3, n))
+        ab[2] = a0
+        ab[1, 1:] = a1[1:]
+        ab[0, 2:] = a2[2:]
+        self.cb = cholesky_banded(ab, lower=False)
+
+    def solve(self, y):
+        from scipy.linalg import cho_solve_banded
+
+        # ±infやNaNはnumpyのエンジンと同じく結果に伝わる（ValueErrorにしない）
+        return cho_solve_banded((self.cb, False), np.asarray(y, dtype=float),
+                                check_finite=False)
+
+
+# ===== Entry points ==========================================================
+
+
+def _default_engine():
+    try:
+        import scipy.linalg   # noqa: F401
+        return 'scipy'
+    except ImportError:
+        return 'numpy'
+
+
+@functools.lru_cache(maxsize=32)
+def factor(n, lamb, engine=None):
+    """
+    Decomposition of I + lamb*D'D for series of length `n` (cached).
+
+    parameters:
+        n: length of the series (n >= 3)
+        lamb: smoothing parameter
+        engine: 'scipy', 'numpy' or None (scipy if it is installed)
+
+    return:
+        object with a `solve(y)` method; `y` is an (n,) or (n, k) array"""
+
+    engine = _default_engine() if engine is None else engine
+
+    if engine == 'scipy':
+        return _BandedCholesky(n, float(lamb))
+    elif engine == 'numpy':
+        return _LDL(n, float(lamb))
+    raise ValueError("engineには'scipy'もしくは'numpy'を指定してください。")
+
+
+def hp_trend(y, lamb=1600, engine=None):
+    """
+    HP trend of the columns of `y`.
+
+    parameters:
+        y: (n,) or (n, k) array without NaN
+        lamb: smoothing parameter
+        engine: see `factor()`, or 'statsmodels' (one `hpfilter()` per column)
+
+    return:
+        array with the same shape as `y`"""
+
+    y = np.asarray(y, dtype=float)
+    n = y.shape[0]
+
+    # 観測値が２つ以下の場合は２階差分がないため，トレンドは元の系列となる
+    if n < 3:
+        return y.copy()
+
+    if engine == 'statsmodels':
+        from statsmodels.tsa.filters.hp_filter import hpfilter
+
+        y2 = y.reshape(n, -1)
+        trends = [hpfilter(y2[:, j], lamb=lamb)[1] for j in range(y2.shape[1])]
+        return np.column_stack(trends).reshape(y.shape)
+
+    return factor(n, float(lamb), engine).solve(y)
+
+
+# ===== One-sided filter (Kalman filter) ======================================
+
+
+_F = np.array([[2.0, -1.0], [1.0, 0.0]])
+
+
+def _kalman_step(P, lamb):
+    """
+    One step of the covariance recursion.
+
+    parameters:
+        P: filtered covariance of (τ_{t-1}, τ_{t-2})
+
+    return:
+        (Kalman gain for y_t, filtered covariance of (τ_t, τ_{t-1}))"""
+
+    P = _F @ P @ _F.T
+    P[0, 0] += 1.0 / lamb
+    gain = P[:, 0] / (P[0, 0] + 1.0)
+    P = P - np.outer(gain, P[0, :])
+    return gain, P
+
+
+@functools.lru_cache(maxsize=32)
+def _kalman_gains(n, lamb):
+    """Kalman gains for t = 0,...,n-1 (they do not depend on the data)."""
+
+    gains = np.zeros((n, 2))
+    P = np.eye(2)
+    for t in range(2, n):
+        gains[t], P = _kalman_step(P, lamb)
+    gains.flags.writeable = False
+    return gains
+
+
+def onesided_trend(y, lamb=1600):
+    """
+    One-sided HP trend of the columns of `y`.
+
+    parameters:
+        y: (n,) or (n, k) array without NaN
+        lamb: smoothing parameter
+
+    return:
+        array with the same shape as `y`"""
+
+    y = np.asarray(y, dtype=float)
+    n = y.shape[0]
+    out = y.copy()
+    if n < 3:
+        return out
+
+    gains = _kalman_gains(n, float(lamb))
+    tau, tau_lag = y[1].copy(), y[0].copy()
+    for t in range(2, n):
+        pred = 2.0 * tau - tau_lag
+        innov = y[t] - pred
+        tau, tau_lag = pred + gains[t, 0] * innov, tau + gains[t, 1] * innov
+        out[t] = tau
+
+    return out
+
+
+class TrendTracker:
+    """|
+       | 片側（リアルタイム）HPフィルターのトレンドを１期ずつ更新するクラス
+       |
+       | 引数：
+       |     lamb: HPフィルターのlambda（デフォルト：1600）
+       |     values: 最初に追加する観測値（デフォルト：None）
+       |
+       | メソッドと属性：
+       |     update(value): 観測値を１つ追加し，最新期のトレンドを返す（計算量はO(1)）
+       |                    欠損値（NaN）と±infは無視される
+       |     extend(values): 観測値を複数追加し，それらの期のトレンドの配列を返す
+       |     trend: 最新期のトレンド
+       |     trends: これまでの全ての期のトレンドのリスト
+       |     nobs: 観測値の数
+       |
+       | t期のトレンドは，t期までのデータに`trend()`を適用した場合の最終期の値と同じになる。
+       |
+       | 例：tracker = py4macro.TrendTracker(1600, df['gdp'])
+       |     tracker.update(new_gdp)"""
+
+    def __init__(self, lamb=1600, values=None):
+        self.lamb = float(lamb)
+        self.nobs = 0
+        self.trends = []
+        self._state = None     # (τ_t, τ_{t-1})
+        self._P = None
+        if values is not None:
+            self.extend(values)
+
+    def __repr__(self):
+        return f'TrendTracker(lamb={self.lamb:g}, nobs={self.nobs}, trend={self.trend})'
+
+    @property
+    def trend(self):
+        return self.trends[-1] if self.trends else np.nan
+
+    def update(self, value):
+        value = float(value)
+        if not np.isfinite(value):
+            return np.nan
+
+        if self.nobs == 0:
+            tau = value
+            self._state = (value, np.nan)
+        elif self.nobs == 1:
+            tau = value
+            self._state = (value, self._state[0])
+            self._P = np.eye(2)
+        else:
+            gain, self._P = _kalman_step(self._P, self.lamb)
+            tau_prev, tau_lag = self._state
+            pred = 2.0 * tau_prev - tau_lag
+            innov = value - pred
+            tau = pred + gain[0] * innov
+            self._state = (tau, tau_prev + gain[1] * innov)
+
+        self.nobs += 1
+        self.trends.append(tau)
+        return tau
+
+    def extend(self, values):
+        return np.array([self.update(v) for v in np.asarray(values, dtype=float).ravel()])
+
+
+# ===== Many series ===========================================================
+
+
+def hp_trend_many(arrays, lamb=1600, engine=None, onesided=False):
+    """
+    HP trends of many series of possibly different lengths.
+
+    Series of the same length share one factorization and are solved together
+    as the columns of one matrix.
+
+    parameters:
+        arrays: list of 1-d arrays without NaN
+        lamb: smoothing parameter
+        engine: see `factor()`, or 'statsmodels' (one `hpfilter()` per series)
+        onesided: if True, one-sided (Kalman filter) trends
+
+    return:
+        list of arrays (trends in the same order as `arrays`)"""
+
+    if (engine == 'statsmodels') and (not onesided):
+        from statsmodels.tsa.filters.hp_filter import hpfilter
+
+        return [hpfilter(a, lamb=lamb)[1] if len(a) > 2 else a.copy() for a in arrays]
+
+    groups = {}
+    for i, a in enumerate(arrays):
+        groups.setdefault(len(a), []).append(i)
+
+    out = [None] * len(arrays)
+    for n, idx in groups.items():
+        y = np.column_stack([arrays[i] for i in idx])
+        trends = onesided_trend(y, lamb) if onesided else hp_trend(y, lamb, engine)
+        for j, i in enumerate(idx):
+            out[i] = trends[:, j]
+
+    return out
+
+
+def trend_panel(x, positions, lamb=1600, engine=None, out=None, onesided=False):
+    """
+    HP trends of the columns of `x` for each group of rows.
+
+    parameters:
+        x: (rows, k) array; NaN and ±inf are dropped from each series before filtering
+        positions: list of integer arrays, the rows of each group in time order
+        lamb: smoothing parameter
+        engine: see `hp_trend_many()`
+        out: (rows, k) array to write the trends into (rows not in `positions`
+             are left untouched); a new array filled with NaN if None
+        onesided: if True, one-sided (Kalman filter) trends
+
+    return:
+        `out`"""
+
+    if out is None:
+        out = np.full(x.shape, np.nan)
+
+    arrays, targets = [], []
+    for p in positions:
+        block = x[p]
+        for j in range(x.shape[1]):
+            v = block[:, j]
+            valid = np.isfinite(v)
+            arrays.append(v[valid])
+            targets.append((p[valid], j))
+
+    for (rows, j), t in zip(targets, hp_trend_many(arrays, lamb, engine, onesided)):
+        out[rows, j] = t
+
+    return out
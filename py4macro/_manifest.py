@@ -0,0 +1,236 @@
+"""
+`py4macro/data/`に含まれるデータ・ファイルのマニフェスト
+
+`data/manifest.json`には次の情報が含まれる（インストール時に`setup.py`が作成する）。
+    * datasets: データ・セット名 -> ファイル名
+    * files: ファイル名 -> 相対パス，サイズ，SHA-256，行数，列のdtype
+
+このモジュールはpandasをインポートせずに読み込めるように書かれている
+（`setup.py`からパッケージをインポートせずに使うため）。
+
+マニフェストの作成：
+    python py4macro/_manifest.py"""
+
+import bz2
+import hashlib
+import json
+import os
+
+MANIFEST_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+# データ・セット名とファイル名の対応
+DATASET_FILES = {
+    'pwt': 'pwt_data.csv.bz2',
+    'weo': 'weo.csv.bz2',
+    'mad': 'mad_country.csv.bz2',
+    'mad-region': 'mad_region.csv.bz2',
+    'jpn-q': 'jpn_quarterly.csv.bz2',
+    'jpn-yr': 'jpn_annual.csv.bz2',
+    'jpn-money': 'jpn_money.csv.bz2',
+    'world-money': 'world_money.csv.bz2',
+    'ex': 'real_ex_rate.csv.bz2',
+    'inequality': 'inequality.csv.bz2',
+    'dates': 'cycle_dates.csv.bz2',
+    'bigmac': 'bigmac.csv.bz2',
+    'debts': 'debts.csv.bz2',
+    'data1': 'data1.csv',
+    'data2': 'data2.csv',
+    'data3': 'data3.csv',
+    'data4': 'data4.csv',
+    'data5': 'data5.csv',
+}
+
+
+# ===== Building the manifest =================================================
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024**2), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _describe(path):
+    """Row count and column dtypes of a CSV file (dtypes need pandas)."""
+
+    try:
+        import pandas as pd
+    except ImportError:
+        opener = bz2.open if path.endswith('.bz2') else open
+        with opener(path, 'rb') as f:
+            rows = sum(1 for _ in f) - 1
+        return rows, None
+
+    df = pd.read_csv(path)
+    return len(df), {c: str(t) for c, t in df.dtypes.items()}
+
+
+def _read_existing(data_dir):
+    """Entries of the `manifest.json` in `data_dir` (empty if there is none)."""
+
+    try:
+        with open(os.path.join(data_dir, MANIFEST_FILE), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest.get('files', {}) if manifest.get('version') == MANIFEST_VERSION else {}
+
+
+def build_manifest(data_dir=DATA_DIR, checksum=True, describe=True, previous=None):
+    """
+    parameters:
+        data_dir: folder containing the data files
+        checksum: if True, record the SHA-256 of each file
+        describe: if True, parse each file to record its row count and dtypes
+        previous: entries of an existing manifest; if the dtypes cannot be
+                  computed (no pandas), those of an entry with the same
+                  SHA-256 are kept
+
+    return:
+        the manifest as a dictionary"""
+
+    previous = previous or {}
+    files = {}
+    for name in sorted(os.listdir(data_dir)):
+        path = os.path.join(data_dir, name)
+        if (name == MANIFEST_FILE) or (not os.path.isfile(path)) or name.startswith('.'):
+            continue
+
+        entry = {'path': f'data/{name}', 'size': os.path.getsize(path)}
+
+        if checksum:
+            entry['sha256'] = _sha256(path)
+
+        if describe and ('.csv' in name):
+            entry['rows'], entry['dtypes'] = _describe(path)
+            old = previous.get(name, {})
+            if (entry['dtypes'] is None) and ('sha256' in entry) \
+                    and (old.get('sha256') == entry['sha256']):
+                entry['dtypes'] = old.get('dtypes')
+
+        files[name] = entry
+
+    return {'version': MANIFEST_VERSION,
+            'datasets': {k: v for k, v in DATASET_FILES.items() if v in files},
+            'files': files}
+
+
+def write_manifest(data_dir=DATA_DIR, out_dir=None, describe=True):
+    """
+    Build the manifest of `data_dir` and write it to `out_dir` (default: `data_dir`).
+    The dtypes of the existing manifest in `data_dir` are kept for unchanged
+    files when pandas is not installed."""
+
+    manifest = build_manifest(data_dir, describe=describe, previous=_read_existing(data_dir))
+    out = os.path.join(data_dir if out_dir is None else out_dir, MANIFEST_FILE)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, ensure_ascii=False)
+        f.write('\n')
+    return out
+
+
+# ===== Loading the manifest ==================================================
+
+
+def load_manifest(data_dir=DATA_DIR):
+    """
+    Read `manifest.json`. If it does not exist (e.g. a source checkout),
+    a manifest without checksums is built from a single directory listing."""
+
+    try:
+        with open(os.path.join(data_dir, MANIFEST_FILE), encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+
+    return build_manifest(data_dir, checksum=False, describe=False)
+
+
+_manifest = None
+
+
+def manifest():
+    global _manifest
+    if _manifest is None:
+        _manifest = load_manifest()
+    return _manifest
+
+
+def file_path(file_name):
+    """Full path of `file_name` in `py4macro/data/` (None if it is not in the manifest)."""
+
+    entry = manifest()['files'].get(file_name)
+    if entry is None:
+        return None
+    return os.path.join(os.path.dirname(DATA_DIR), *entry['path'].split('/'))
+
+
+def file_dtypes(file_name):
+    """Column dtypes of `file_name` parsed by `pd.read_csv()` without arguments (None if unknown)."""
+
+    entry = manifest()['files'].get(file_name)
+    return None if entry is None else entry.get('dtypes')
+
+
+# ===== Integrity check =======================================================
+
+
+def verify_data(dataset=None, checksum=True):
+    """|
+       | 同梱されているデータ・ファイルがマニフェストと一致するかを確認する
+       |
+       | 引数：
+       |     dataset: データ・セット名（例：'pwt'）もしくはファイル名
+       |              Noneの場合は全てのファイル（デフォルト：None）
+       |     checksum: Trueの場合はSHA-256も確認する（デフォルト：True）
+       |               Falseの場合はファイル・サイズのみを確認する
+       |
+       | 戻り値：
+       |     ファイル名をキー，結果を値とする辞書
+       |         'ok': 一致
+       |         'missing': ファイルが存在しない
+       |         'size': ファイル・サイズが異なる
+       |         'sha256': SHA-256が異なる
+       |         'unknown': マニフェストにチェックサムがない
+       |
+       | 例：py4macro.verify_data('pwt')"""
+
+    m = manifest()
+
+    if dataset is None:
+        names = list(m['files'])
+    else:
+        name = m['datasets'].get(dataset, dataset)
+        if name not in m['files']:
+            raise ValueError(f"{dataset}はマニフェストに含まれていません。")
+        names = [name]
+
+    result = {}
+    for name in names:
+        entry = m['files'][name]
+        path = file_path(name)
+        if not os.path.isfile(path):
+            result[name] = 'missing'
+        elif os.path.getsize(path) != entry['size']:
+            result[name] = 'size'
+        elif not checksum:
+            result[name] = 'ok'
+        elif 'sha256' not in entry:
+            result[name] = 'unknown'
+        elif _sha256(path) != entry['sha256']:
+            result[name] = 'sha256'
+        else:
+            result[name] = 'ok'
+
+    return result
+
+
+if __name__ == '__main__':
+    print(write_manifest())
@@ -0,0 +1,94 @@
+"""
+景気循環のモーメント（`cycle_stats()`で使う）
+
+系列は(グループ, 期間, 変数)の３次元の配列にまとめ，欠損値はNaNとする。
+t期の変数xとt+k期の値の相関（リード・ラグの相互相関）は，重なる期間の
+ピアソン相関（`x.shift(-k).corr(y)`と同じ）として次の和から計算する。
+
+    N_k, Σx, Σy, Σx², Σy², Σxy   （いずれも両方の値が存在する期間の和）
+
+それぞれは欠損値を0とした系列と欠損値の有無を表す系列の相互相関であり，
+全てのグループと変数についてFFTでまとめて計算する。"""
+
+import numpy as np
+
+
+def stack_groups(x, positions):
+    """
+    parameters:
+        x: (rows, k) array
+        positions: list of integer arrays, the rows of each group in time order
+
+    return:
+        (groups, periods, k) array padded with NaN"""
+
+    lengths = np.array([len(p) for p in positions], dtype=int)
+    G, L = len(positions), (lengths.max() if len(lengths) else 0)
+    out = np.full((G, L, x.shape[1]), np.nan)
+
+    if lengths.sum() > 0:
+        starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        gi = np.repeat(np.arange(G), lengths)
+        ti = np.arange(lengths.sum()) - starts
+        out[gi, ti] = x[np.concatenate(positions)]
+
+    return out
+
+
+def _xcorr(a, b, lags, nfft):
+    """Σ_t a[t+k] b[t] for k = -lags,...,lags along axis 1 (FFT)."""
+
+    c = np.fft.irfft(np.fft.rfft(a, nfft, axis=1) * np.conj(np.fft.rfft(b, nfft, axis=1)),
+                     nfft, axis=1)
+    return np.concatenate([c[:, nfft-lags:], c[:, :lags+1]], axis=1)
+
+
+def _pearson(n, sx, sy, sxx, syy, sxy):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        num = n * sxy - sx * sy
+        den = np.sqrt((n * sxx - sx**2) * (n * syy - sy**2))
+        r = num / den
+    r[~(den > 0) | (n < 2)] = np.nan
+    return r
+
+
+def moments(x, ref, lags=4):
+    """
+    parameters:
+        x: (groups, periods, k) array from `stack_groups()`
+        ref: position of the reference variable (e.g. gdp) on the last axis
+        lags: maximum lead/lag k
+
+    return:
+        dictionary of arrays of shape (groups, k)
+            'std', 'relative std', 'autocorr', and
+            'xcorr' of shape (groups, k, 2*lags+1): corr(x[t+k], ref[t])"""
+
+    G, L, k = x.shape
+    mask = ~np.isnan(x)
+    count = mask.sum(axis=1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # 中心化しておくと和の計算で桁落ちしにくい（相関係数は変わらない）
+        mean = np.where(count > 0, np.nansum(x, axis=1) / np.maximum(count, 1), 0.0)
+        xc = np.where(mask, x - mean[:, None, :], 0.0)
+        var = (xc**2).sum(axis=1) / (count - 1)
+        std = np.where(count > 1, np.sqrt(var), np.nan)
+        relative = std / std[:, [ref]]
+
+    # １次の自己相関：t期とt-1期の両方がある期間のピアソン相関
+    m = (mask[:, 1:] & mask[:, :-1]).astype(float)
+    a, b = xc[:, 1:] * m, xc[:, :-1] * m
+    autocorr = _pearson(m.sum(axis=1), a.sum(axis=1), b.sum(axis=1),
+                        (a**2).sum(axis=1), (b**2).sum(axis=1), (a * b).sum(axis=1))
+
+    # 基準変数とのリード・ラグの相互相関
+    nfft = 1 << max(int(L + lags - 1).bit_length(), 1)
+    mx = mask.astype(float)
+    my, y = mx[:, :, [ref]], xc[:, :, [ref]]
+    sums = [_xcorr(a, b, lags, nfft) for a, b in
+            [(mx, my), (xc, my), (mx, y), (xc**2, my), (mx, y**2), (xc, y)]]
+    n = np.rint(sums[0])
+    xcorr = _pearson(n, *sums[1:]).transpose(0, 2, 1)
+
+    return {'std': std, 'relative std': relative, 'autocorr': autocorr, 'xcorr': xcorr}
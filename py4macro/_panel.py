@@ -0,0 +1,192 @@
+"""
+国と年のパネル・データの索引（`panel()`）
+
+行を(国コード, 年)で並べ替え，次の配列を一度だけ作成する。
+
+    codes: 国コード（並べ替え済み）
+    offsets: 各国の最初の行の位置（最後の要素は行数）
+    key: 行毎の「国の番号 * 年の数 + (年 - 最初の年)」（単調増加）
+
+国の選択は`codes`の二分探索，年の範囲の選択は`key`の二分探索で行うため，
+選択に必要な計算は国の数 m について O(m log n)（nは行数）であり，
+`df[(df['countrycode'] == 'JPN') & (df['year'] >= 1990)]`のような全ての行の比較は行わない。
+`income_group`，`region`，`continent`など国毎に一定の列は，値 -> 国の番号の辞書を
+最初に使う際に作成して使い回す。"""
+
+import numpy as np
+import pandas as pd
+
+
+def _ranges(lo, hi):
+    """
+    Concatenation of np.arange(lo[i], hi[i]) for all i, or a slice if the
+    ranges are adjacent (e.g. one country), so that `iloc` returns a view."""
+
+    keep = hi > lo
+    lo, hi = lo[keep], hi[keep]
+    if len(lo) == 0:
+        return slice(0, 0)
+    if (hi[:-1] == lo[1:]).all():
+        return slice(int(lo[0]), int(hi[-1]))
+
+    lengths = hi - lo
+    total = int(lengths.sum())
+    starts = np.repeat(lo - np.cumsum(lengths) + lengths, lengths)
+    return starts + np.arange(total)
+
+
+class Panel:
+    """|
+       | 国と年のパネル・データの索引（`py4macro.panel()`が返すオブジェクト）
+       |
+       | 属性：
+       |     frame: (国コード, 年)のMultiIndexで並べ替えたDataFrame
+       |     countries: 国コードのリスト
+       |     years: 年のリスト
+       |
+       | メソッド：
+       |     select(countries=None, years=None, **groups): 行を選択したDataFrameを返す
+       |         countries: 国コード（文字列もしくはリスト）
+       |         years: 整数，(start, end)のタプル（両端を含む，Noneは上限・下限なし）もしくはリスト
+       |         groups: 国毎に一定の列の値（文字列もしくはリスト）
+       |                 例：income_group='High income'，region=['East Asia & Pacific', 'South Asia']
+       |     wide(column, countries=None, years=None, **groups): 国 x 年のDataFrameを返す
+       |     members(column): 列の値 -> 国コードのリストの辞書を返す（例：members('continent')）
+       |
+       | 例：pwt = py4macro.panel('pwt')
+       |     pwt.select('JPN', years=(1990, None))
+       |     pwt.select(years=(2000, 2019), income_group='High income')
+       |     pwt.wide('rgdpna', continent='Asia')"""
+
+    def __init__(self, df, country='countrycode', time='year'):
+        for c in (country, time):
+            if c not in df.columns:
+                raise ValueError(f"'{c}'の列がありません。")
+
+        frame = df.set_index([country, time])
+        if not frame.index.is_monotonic_increasing:
+            frame = frame.sort_index(kind='stable')
+        if not frame.index.is_unique:
+            raise ValueError(f"({country}, {time})が重複する行があります。")
+
+        self.frame = frame
+        self._country = country
+        self._time = time
+
+        code = frame.index.get_level_values(0).to_numpy()
+        year = frame.index.get_level_values(1).to_numpy().astype(np.int64)
+        n = len(code)
+
+        starts = np.flatnonzero(np.r_[True, code[1:] != code[:-1]]) if n > 0 else np.empty(0, int)
+        self._codes = code[starts]
+        self._offsets = np.r_[starts, n]
+        self._year_min = int(year.min()) if n > 0 else 0
+        self._span = int(year.max()) - self._year_min + 1 if n > 0 else 1
+        self._group = np.repeat(np.arange(len(starts)), np.diff(self._offsets))
+        self._year = year
+        self._key = self._group * self._span + (year - self._year_min)
+        self._members = {}
+
+    def __repr__(self):
+        return (f'Panel({len(self._codes)} countries, {len(self._year)} rows, '
+                f'{self.frame.shape[1]} columns)')
+
+    def __len__(self):
+        return len(self._year)
+
+    @property
+    def countries(self):
+        return list(self._codes)
+
+    @property
+    def years(self):
+        return sorted(set(self._year.tolist()))
+
+    # ----- Group lookups -----------------------------------------------------
+
+    def _group_index(self, countries):
+        """Positions of `countries` in `codes` (binary search)."""
+
+        wanted = np.asarray([countries] if isinstance(countries, str) else list(countries),
+                            dtype=object)
+        pos = np.searchsorted(self._codes, wanted)
+        found = (pos < len(self._codes)) & (self._codes[np.minimum(pos, len(self._codes) - 1)] == wanted)
+        if not found.all():
+            raise ValueError(f"次の国コードはありません：{list(wanted[~found])}")
+        return np.unique(pos)
+
+    def _column_members(self, column):
+        """Dictionary value -> array of group positions for a column constant within countries."""
+
+        if column not in self._members:
+            if column not in self.frame.columns:
+                raise ValueError(f"'{column}'の列がありません。")
+            values = self.frame[column].to_numpy()
+            first = values[self._offsets[:-1]]
+            expanded = np.repeat(first, np.diff(self._offsets))
+            same = (expanded == values) | (pd.isna(expanded) & pd.isna(values))
+            if not same.all():
+                raise ValueError(f"'{column}'は国毎に一定ではないため使えません。")
+            members = {}
+            for i, v in enumerate(first):
+                if not pd.isna(v):
+                    members.setdefault(v, []).append(i)
+            self._members[column] = {v: np.array(g) for v, g in members.items()}
+        return self._members[column]
+
+    def members(self, column):
+        return {v: list(self._codes[g]) for v, g in self._column_members(column).items()}
+
+    # ----- Queries -------------------------------------------------------------
+
+    def _positions(self, countries=None, years=None, groups=None):
+        """Row positions (array or slice) of `frame` matching the query, in the order of `frame`."""
+
+        from .py4macro import _normalize_pushdown
+
+        g = (np.arange(len(self._codes)) if countries is None
+             else self._group_index(countries))
+
+        for column, values in (groups or {}).items():
+            members = self._column_members(column)
+            values = [values] if isinstance(values, str) or np.isscalar(values) else values
+            chosen = [members[v] for v in values if v in members]
+            g = np.intersect1d(g, np.concatenate(chosen) if chosen else np.empty(0, int))
+
+        years = _normalize_pushdown(None, None, years)[2] if years is not None else None
+
+        if (years is None) or (years[0] == 'in'):
+            positions = _ranges(self._offsets[g], self._offsets[g + 1])
+            if years is not None:
+                positions = np.arange(len(self._year))[positions]
+                positions = positions[np.isin(self._year[positions], list(years[1]))]
+            return positions
+
+        _, start, end = years
+        start = self._year_min if start is None else max(start, self._year_min)
+        end = self._year_min + self._span - 1 if end is None else min(end, self._year_min + self._span - 1)
+        if start > end:
+            return slice(0, 0)
+        base = g * self._span - self._year_min
+        lo = np.searchsorted(self._key, base + start, side='left')
+        hi = np.searchsorted(self._key, base + end, side='right')
+        return _ranges(lo, hi)
+
+    def select(self, countries=None, years=None, **groups):
+        return self.frame.iloc[self._positions(countries, years, groups)]
+
+    def wide(self, column, countries=None, years=None, **groups):
+        if column not in self.frame.columns:
+            raise ValueError(f"'{column}'の列がありません。")
+
+        positions = self._positions(countries, years, groups)
+        values = self.frame[column].to_numpy()[positions]
+        g, row = np.unique(self._group[positions], return_inverse=True)
+        y, col = np.unique(self._year[positions], return_inverse=True)
+
+        out = np.full((len(g), len(y)), np.nan,
+                      dtype=float if values.dtype.kind in 'biuf' else object)
+        out[row, col] = values
+        return pd.DataFrame(out,
+                            index=pd.Index(self._codes[g], name=self._country),
+                            columns=pd.Index(y, name=self._time))
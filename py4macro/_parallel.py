@@ -0,0 +1,108 @@
+"""
+プロセス・プールを使ったパネル・データのHPフィルター
+
+値の行列と結果の行列を`multiprocessing.shared_memory`に置き，各プロセスには
+共有メモリの名前とグループ（国など）の行番号のみを渡す。各プロセスは異なる行に
+書き込むため，結果は逐次計算（`n_jobs=1`）と同じになる。
+
+`multiprocessing`と`concurrent.futures`のプロセス・プールは使う時点でインポートする
+（JupyterLite/Pyodideなどでは使えないため，`data()`や`n_jobs=1`では読み込まない）。"""
+
+import os
+import sys
+
+import numpy as np
+
+from . import _hp
+
+
+def _attach(name):
+    """Attach to a shared memory block created (and unlinked) by the parent process."""
+
+    from multiprocessing.shared_memory import SharedMemory
+
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+
+    # プール内のプロセスは親プロセスのresource trackerを共有するため，
+    # 接続による登録は親プロセスの`unlink()`で解除される
+    return SharedMemory(name=name)
+
+
+def _worker(in_name, out_name, shape, positions, lamb, engine, onesided):
+    shm_in, shm_out = _attach(in_name), _attach(out_name)
+    try:
+        x = np.ndarray(shape, dtype=np.float64, buffer=shm_in.buf)
+        out = np.ndarray(shape, dtype=np.float64, buffer=shm_out.buf)
+        _hp.trend_panel(x, positions, lamb, engine, out=out, onesided=onesided)
+        del x, out
+    finally:
+        shm_in.close()
+        shm_out.close()
+
+
+def n_workers(n_jobs):
+    """Number of processes for `n_jobs` (-1: all CPUs)."""
+
+    if (n_jobs is None) or (n_jobs == 1):
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return int(n_jobs)
+
+
+def partition(positions, n):
+    """Split the groups into at most `n` contiguous chunks with similar numbers of rows."""
+
+    sizes = np.cumsum([len(p) for p in positions])
+    if len(sizes) == 0:
+        return []
+    bounds = np.searchsorted(sizes, sizes[-1] * np.arange(1, n) / n, side='right')
+    chunks = np.split(np.arange(len(positions)), bounds)
+    return [[positions[i] for i in c] for c in chunks if len(c) > 0]
+
+
+def trend_panel(x, positions, lamb=1600, engine=None, n_jobs=-1, onesided=False):
+    """
+    Parallel version of `_hp.trend_panel()`.
+
+    parameters:
+        x: (rows, k) float array
+        positions: list of integer arrays, the rows of each group in time order
+        n_jobs: number of processes (-1: all CPUs)
+
+    return:
+        (rows, k) array of trends"""
+
+    n = n_workers(n_jobs)
+    chunks = partition(positions, n)
+    if len(chunks) <= 1:
+        return _hp.trend_panel(x, positions, lamb, engine, onesided=onesided)
+
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing.shared_memory import SharedMemory
+
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    nbytes = max(x.nbytes, 1)
+    shm_in = SharedMemory(create=True, size=nbytes)
+    shm_out = SharedMemory(create=True, size=nbytes)
+    try:
+        np.ndarray(x.shape, dtype=np.float64, buffer=shm_in.buf)[...] = x
+        out = np.ndarray(x.shape, dtype=np.float64, buffer=shm_out.buf)
+        out[...] = np.nan
+
+        with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+            futures = [pool.submit(_worker, shm_in.name, shm_out.name, x.shape,
+                                   chunk, lamb, engine, onesided)
+                       for chunk in chunks]
+            for f in futures:
+                f.result()
+
+        result = out.copy()
+        del out
+        return result
+
+    finally:
+        for shm in (shm_in, shm_out):
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,96 @@
+"""
+`data()`で読み込むデータ・セットのレジストリ
+
+データ・セットごとに読み込み方（ファイル，`pd.read_csv()`の引数，後処理，
+識別用の列，変数の定義）を`DatasetSpec`として登録する。`data()`は辞書を使い
+データ・セット名から直接`DatasetSpec`を取り出す。
+
+独自のデータ・セットは`register_dataset()`で追加できる。"""
+
+import os
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """
+    name: dataset name passed to `data()`
+    file: file name in `py4macro/data/` or a full path
+    title: one-line description shown in the list of datasets
+    read_kwargs: keyword arguments passed to `pd.read_csv()`
+    post: function applied to the DataFrame after `pd.read_csv()`
+    keys: identifier columns always kept by `data(columns=...)`
+    definitions: text printed by `data(name, description=1)`
+    definitions_table: DatasetSpec of the table returned by `data(name, description=2)`
+                       (displayed by `description=1` when `definitions` is None)"""
+
+    name: str
+    file: str
+    title: str = ''
+    read_kwargs: dict = field(default_factory=dict)
+    post: object = None
+    keys: tuple = ()
+    definitions: str = None
+    definitions_table: 'DatasetSpec' = None
+
+    @property
+    def descriptions(self):
+        """Valid values of the `description` argument of `data()`."""
+
+        if self.definitions_table is not None:
+            return (0, 1, 2)
+        if self.definitions is not None:
+            return (0, 1)
+        return None
+
+
+_registry = {}
+
+
+def get(name):
+    return _registry.get(name)
+
+
+def names():
+    return list(_registry)
+
+
+def register(spec, overwrite=False):
+    if spec.name in _registry:
+        if not overwrite:
+            raise ValueError(f"'{spec.name}'は既に登録されています。上書きする場合はoverwrite=Trueとしてください。")
+        # 以前の登録で読み込んだデータはキャッシュに残さない
+        from . import _cache
+        _cache.forget(spec.name)
+    _registry[spec.name] = spec
+    return spec
+
+
+def register_dataset(name, file, title='', definitions=None, keys=(), post=None,
+                     overwrite=False, **read_kwargs):
+    """|
+       | `py4macro.data()`で読み込むデータ・セットを登録する
+       |
+       | 引数：
+       |     name: データ・セット名（`data(name)`で読み込む）
+       |     file: CSVファイルのパス（相対パスは登録した時点の作業フォルダからのパス）
+       |     title: データ・セットの説明（１行）
+       |     definitions: 変数の定義（`data(name, description=1)`で表示される文字列）
+       |     keys: 識別用の列（`data(name, columns=...)`でも常に含まれる列）
+       |     post: 読み込んだDataFrameに適用する関数（例：lambda df: df.set_index('date')）
+       |     overwrite: Trueの場合，同じ名前のデータ・セットを上書きする（デフォルト：False）
+       |         * 上書きしたデータ・セットのキャッシュは削除される
+       |     read_kwargs: `pd.read_csv()`に渡す引数（例：compression='bz2'）
+       |
+       | 戻り値：
+       |     なし
+       |
+       | 登録したデータ・セットにもキャッシュと引数`columns`，`countries`，`years`が適用される。
+       |
+       | 例：py4macro.register_dataset('my-data', '/path/to/my_data.csv',
+       |                               title='独自のデータ', keys=['countrycode', 'year'])"""
+
+    register(DatasetSpec(name=name, file=os.path.abspath(os.path.expanduser(file)), title=title,
+                         read_kwargs=read_kwargs, post=post, keys=tuple(keys),
+                         definitions=definitions),
+             overwrite=overwrite)
@@ -0,0 +1,90 @@
+"""
+図をまとめて作成しファイルに保存する（`render_many()`）
+
+* `pyplot`は使わず，Aggの`Figure`を直接使う（GUIのバックエンドは不要）
+* 各プロセスは最初にデータ・セットと景気循環日付を一度だけ読み込む
+* 図（`Figure`と軸）は大きさ毎に一度だけ作成し，軸を消去して使い回す"""
+
+import os
+import time
+
+# 各プロセスで使い回す図：figsize -> (Figure, Axes)
+_templates = {}
+
+
+def _template(figsize, dpi):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    key = (tuple(figsize), dpi)
+    if key not in _templates:
+        fig = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(fig)
+        _templates[key] = (fig, fig.add_subplot())
+
+    fig, ax = _templates[key]
+    ax.clear()
+    return fig, ax
+
+
+def validate(specs):
+    """Raise ValueError if a spec has no 'dataset' or 'file'."""
+
+    for i, spec in enumerate(specs):
+        missing = [k for k in ('dataset', 'file') if k not in spec]
+        if missing:
+            raise ValueError(f"specs[{i}]に次のキーがありません：{missing}")
+
+
+def preload(datasets):
+    """Read `datasets` and the business cycle dates into the cache of this process."""
+
+    from . import py4macro
+
+    for name in datasets:
+        py4macro.data(name)
+    py4macro._cycle_dates()
+
+
+def render(spec, out_dir, dpi=100):
+    """
+    Draw one chart and save it to `out_dir`.
+
+    return:
+        dictionary with the file name, seconds, process id and error (None if successful)"""
+
+    from . import py4macro
+
+    start = time.perf_counter()
+    error = None
+    try:
+        df = py4macro.data(spec['dataset'])
+        columns = spec.get('columns')
+        if columns is not None:
+            df = df[[columns] if isinstance(columns, str) else list(columns)]
+        df = df.loc[spec.get('start'):spec.get('end')]
+
+        fig, ax = _template(spec.get('figsize', (6.4, 4.8)), dpi)
+        for c in df.columns:
+            ax.plot(df.index, df[c], label=c)
+        if df.shape[1] > 1:
+            ax.legend()
+        ax.set_title(spec.get('title', ''))
+        ax.set_ylabel(spec.get('ylabel', ''))
+
+        shade = spec.get('fukyo', True)
+        if shade:
+            kwargs = dict(shade) if isinstance(shade, dict) else {}
+            if len(df) > 0:
+                kwargs.setdefault('start', df.index[0].year)
+            py4macro.fukyo(ax, **kwargs)
+
+        fig.savefig(os.path.join(out_dir, spec['file']))
+    except Exception as e:
+        error = f'{type(e).__name__}: {e}'
+
+    return {'file': spec['file'],
+            'dataset': spec['dataset'],
+            'seconds': time.perf_counter() - start,
+            'pid': os.getpid(),
+            'error': error}
@@ -0,0 +1,105 @@
+"""
+プロセス間で共有するDataFrame（`set_cache(shared=True)`）
+
+最初に読み込んだプロセスがDataFrameを非圧縮のArrow IPCファイルに書き出し，
+全てのプロセス（書き出したプロセスも含む）はそのファイルをメモリ・マップする。
+
+* 数値の列と文字列の列はマップしたページを直接参照する（ゼロ・コピー）。
+  ページはOSのページ・キャッシュで共有されるため，プロセスの数が増えても
+  データのメモリは１つ分のみとなる。
+* 浮動小数点数の欠損値はArrowのnullに変換せずNaNのまま保存する
+  （nullがあると読み込む際にNaNで埋めたコピーが必要になる）。
+* ファイルは既定で`/dev/shm`（メモリ上のファイル・システム）のユーザー毎のフォルダ
+  （`/dev/shm/py4macro-<uid>`，所有者のみアクセスできる）に置く。
+  所有者が異なる，もしくは他のユーザーが書き込めるフォルダは使わない。
+* `pyarrow`が必要。"""
+
+import os
+import stat
+import threading
+
+import numpy as np
+
+
+def default_directory(cache_directory):
+    """`/dev/shm/py4macro-<uid>` if available, otherwise a subfolder of the disk cache."""
+
+    if os.path.isdir('/dev/shm') and hasattr(os, 'getuid'):
+        return os.path.join('/dev/shm', f'py4macro-{os.getuid()}')
+    return os.path.join(cache_directory, 'shared')
+
+
+def _check_directory(directory, create=False):
+    """
+    Raise PermissionError unless `directory` is a folder owned by the current
+    user which other users cannot write to (created with mode 0o700 if
+    `create` is True). Ownership is not checked where there are no uids."""
+
+    if create:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+    st = os.lstat(directory)
+    if not stat.S_ISDIR(st.st_mode):
+        raise PermissionError(f'{directory} is not a directory')
+    if hasattr(os, 'getuid') and ((st.st_uid != os.getuid()) or (st.st_mode & 0o022)):
+        raise PermissionError(f'{directory} is not private to the current user')
+
+
+def _to_table(df):
+    """Arrow table of `df` with NaN kept as values in the float columns."""
+
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df)
+    for i, name in enumerate(table.column_names):
+        if (name in df.columns) and isinstance(df[name].dtype, np.dtype) \
+                and (df[name].dtype.kind == 'f'):
+            values = pa.array(df[name].to_numpy(), from_pandas=False)
+            table = table.set_column(i, table.schema.field(i), values)
+    return table
+
+
+def attach(path):
+    """
+    Memory-map the Arrow IPC file `path`.
+
+    return:
+        DataFrame referencing the mapped pages (None if the file does not
+        exist or its folder is not private to the current user)"""
+
+    import pyarrow as pa
+    import pyarrow.ipc
+
+    if not os.path.exists(path):
+        return None
+    try:
+        _check_directory(os.path.dirname(path))
+    except OSError:
+        return None
+    try:
+        table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+    except (OSError, pa.ArrowInvalid):
+        # 書き込み途中もしくは壊れたファイルは作り直す
+        return None
+    return table.to_pandas(split_blocks=True)
+
+
+def publish(path, df):
+    """
+    Write `df` to `path` (atomically) and return the memory-mapped frame.
+
+    Raises ImportError if pyarrow is not installed, and PermissionError if
+    the folder is not private to the current user."""
+
+    import pyarrow as pa
+    import pyarrow.ipc
+
+    table = _to_table(df)
+    _check_directory(os.path.dirname(path), create=True)
+    tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with pa.OSFile(tmp, 'wb') as f:
+        with pa.ipc.new_file(f, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, path)
+
+    mapped = attach(path)
+    return df if mapped is None else mapped
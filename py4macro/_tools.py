@@ -0,0 +1,271 @@
+"""
+pandasを必要としない関数
+
+`import py4macro`の後に`py4macro.xvalues()`や`py4macro.see()`を使っても
+pandasはインポートされない。"""
+
+import functools
+import inspect
+from math import ceil
+
+
+# ===== xvalues function ======================================================
+
+
+def _linspace_chunks(low, high, number, chunksize):
+    """
+    Generator of the chunks of `numpy.linspace(low, high, number)`.
+
+    Each value is computed as in `numpy.linspace()` (i*step + low, the last
+    value is `high`), so the concatenated chunks are identical to it."""
+
+    import numpy as np
+
+    step = (high - low) / (number - 1)
+    for start in range(0, number, chunksize):
+        stop = min(start + chunksize, number)
+        chunk = np.arange(start, stop, dtype=float) * step + low
+        if stop == number:
+            chunk[-1] = high
+        yield chunk
+
+
+def xvalues(low, high, number, as_array=False, chunksize=None):
+    """引数
+        low：最小値（lowest value）
+        high：最大値（highest value）
+        number：作成する数値の数を指定する（正の整数型，number of values）
+        as_array：Trueの場合，NumPyのarray（float64）を返す（デフォルトはFalse）
+                  `numpy.linspace(low, high, number)`と同じ値になる
+        chunksize：正の整数の場合，chunksize個ずつの要素から構成されるarrayを
+                   順番に返すイテレーター（ジェネレーター）を返す（デフォルトはNone）
+                   全ての要素を一度にメモリに作成しないため，非常に大きなグリッドに使う
+    戻り値
+        number個の要素から構成されるリスト（as_array=Trueの場合はarray，
+        chunksizeを指定した場合はarrayのイテレーター）
+
+    例：for x in xvalues(0, 1, 10**9, chunksize=10**6):
+            ..."""
+
+    if (number <= 1) or (not isinstance(number, int)):
+        raise Exception(f"引数 number には2以上の整数型を使う必要があります。number={number}となっています。")
+    elif low >= high:
+        raise Exception(
+            "引数 low と high の値では low>high もしくは low=high となります。low<high となるように値を設定し直してください。"
+        )
+    elif chunksize is not None:
+        if (not isinstance(chunksize, int)) or (chunksize < 1):
+            raise ValueError(f"引数 chunksize には正の整数を使う必要があります。chunksize={chunksize}となっています。")
+        return _linspace_chunks(low, high, number, chunksize)
+    elif as_array:
+        import numpy as np
+
+        return np.linspace(low, high, number)
+    else:
+        return [low + x*(high-low)/(number-1) for x in range(number)]
+
+
+# ===== see function (show attributes) =======================================
+
+
+def _create_template(obj, col, width):
+    """
+    表示用のテンプレートを作成する関数
+
+    引数：
+        obj: 属性を調べるオブジェクト
+        col: 表示する際の列の数
+        width: 表示の幅
+        　　　　　(列の幅は width/col 以上である最小整数となる)
+    戻り値：
+        テンプレートを含む辞書
+            値：任意の行の列
+            値：テンプレートのリスト
+
+
+    例：3つの列があり，表示全体の幅は20
+
+　　    _create_template(obj_x, col=3, width=20)
+
+       ＜実行結果＞
+        {1: ['{0:7}'], 2: ['{0:7}', '{0:7}'], 3: ['{0:7}', '{0:7}', '{0:7}']}
+
+        キー：表示される行に列が1つしかない場合，2つしかない場合，３つある場合を表す。
+        値：.format()関数に使い，文字列を代入するためのテンプレート
+            値にある0は .format()関数を使う際の位置引数の値
+            値にある7は各列の幅を表す
+        (注意) width=20は実行結果の7の計算に使われている。
+    """
+
+    # set width of each column
+    col_width = ceil(width/col)
+
+    # template for each column
+    temp = ["{" + str(0) + ":" + str(col_width) + "}"]
+
+    # create templates for rows
+    # with one column, two columns, three columns,...
+    template_dic = {}
+
+    for i in range(1, col+1):
+
+        template_dic[i] = temp * i
+
+    return template_dic
+
+
+def _is_callable_static(attr):
+    """
+    Whether an attribute found by `inspect.getattr_static()` is a method.
+
+    return:
+        True or False, or None for descriptors other than properties (e.g.
+        `DataFrame.plot`, `__slots__` members), which are cheap to evaluate
+        and are therefore classified by `getattr()` on each object"""
+
+    if isinstance(attr, (property, functools.cached_property)):
+        return False
+    if isinstance(attr, (staticmethod, classmethod)) or callable(attr):
+        return True
+    if hasattr(type(attr), '__get__'):
+        return None
+    return False
+
+
+@functools.lru_cache(maxsize=256)
+def _class_attributes(cls):
+    """name -> True/False/None (see `_is_callable_static()`) for the public attributes of `cls` (cached)."""
+
+    out = {}
+    for name in dir(cls):
+        if name[0] == "_":
+            continue
+        try:
+            out[name] = _is_callable_static(inspect.getattr_static(cls, name))
+        except AttributeError:
+            out[name] = False
+    return out
+
+
+def _display_names_static(obj, names):
+    """Attribute names with "()" for callables, without evaluating properties."""
+
+    # クラス自体の場合はそのクラス，インスタンスの場合はその型の属性を調べる（型毎にキャッシュ）
+    cls = obj if isinstance(obj, type) else type(obj)
+    class_attrs = _class_attributes(cls)
+
+    # インスタンスの属性（__dict__にある値）はすでに存在する値なので評価にはならない
+    try:
+        instance_dict = object.__getattribute__(obj, "__dict__")
+    except AttributeError:
+        instance_dict = {}
+    if isinstance(obj, type):
+        instance_dict = {}
+
+    display_lst = []
+    for attr in names:
+        if attr in instance_dict:
+            is_callable = callable(instance_dict[attr])
+        else:
+            # __getattr__で作られる属性（DataFrameの列など）は呼び出し可能ではないとする
+            is_callable = class_attrs.get(attr, False)
+        if is_callable is None:
+            # プロパティ以外のデスクリプタ（.plotなど）は評価しても時間がかからない
+            try:
+                is_callable = callable(getattr(obj, attr))
+            except Exception:
+                is_callable = False
+        display_lst.append(attr + "()" if is_callable else attr)
+
+    return display_lst
+
+
+def _display_names_evaluated(obj, names):
+    """Attribute names with "()" for callables, evaluating every attribute with getattr()."""
+
+    display_lst = []
+    for attr in names:
+        try:
+            attr_val = getattr(obj, attr)
+            if callable(attr_val):
+                display_lst.append(attr + "()")
+            else:
+                display_lst.append(attr)
+        except Exception:
+            display_lst.append(attr)
+    return display_lst
+
+
+@functools.lru_cache(maxsize=256)
+def _format(display_names, col):
+    """Lines of the formatted attribute list (cached)."""
+
+    # Determine max length of attribute string (after dot)
+    max_attr_len = max(len(attr) for attr in display_names)
+
+    # Format attributes with alignment at the dot
+    formatted_attrs = [f".{attr:<{max_attr_len}}" for attr in display_names]
+
+    # Break into rows
+    new_lst = []
+    for i in range(ceil(len(formatted_attrs) / col)):
+        new_lst.append(formatted_attrs[i * col:i * col + col])
+
+    # Set uniform column width
+    col_width = max_attr_len + 1  # plus 1 for dot
+
+    # Create templates
+    template = {i: [f"{{0:<{col_width}}}"] * i for i in range(1, col + 1)}
+
+    lines = []
+    for inner_lst in new_lst:
+        num = len(inner_lst)
+        line_str = ""
+        for idx, j in enumerate(template[num]):
+            line_str += j.format(inner_lst[idx]) + "  "
+        lines.append(line_str.strip())
+
+    return "\n".join(lines)
+
+
+def see(obj, col=4, width=70, static=False):
+    """
+    オブジェクトの属性（`_`もしくは`__`が付いた属性以外）を表示する
+    メソッドは`()`が付いて表示される。
+
+    引数：
+        obj: 属性を調べるオブジェクト
+        col: 表示する際の列の数（デフォルトは4）
+        width: 表示の幅（デフォルトは70）
+        　　　　　(列の幅は width/col 以上である最小整数となる)
+        static: Trueの場合，プロパティを評価せずに（`inspect.getattr_static()`を使い）
+                メソッドかどうかを判定する（デフォルトはFalse）
+                * プロパティは計算されないため，大きなDataFrameなどでも時間がかからない
+                * 判定結果は型毎にキャッシュされる
+                * プロパティが返す呼び出し可能なオブジェクト（例：DataFrameの.locや.iloc）には
+                  `()`が付かない
+                Falseの場合，全ての属性を`getattr()`で評価して判定する
+    戻り値：
+        None (表示のみ)
+
+
+    例：整数型である100の属性を調べる。
+
+       see(100)
+
+       ＜実行結果＞
+
+       .as_integer_ratio()  .bit_count()     .bit_length()    .conjugate()
+       .denominator         .from_bytes()    .imag            .is_integer()
+       .numerator           .real            .to_bytes()
+    """
+
+    lst = [i for i in dir(obj) if i[0] != "_"]
+
+    # Prepare display names with () for callables
+    if static:
+        display_lst = _display_names_static(obj, lst)
+    else:
+        display_lst = _display_names_evaluated(obj, lst)
+
+    print(_format(tuple(display_lst), col))
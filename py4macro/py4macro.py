@@ -2,265 +2,31 @@ import functools
 import numpy as np
 import os
 import pandas as pd
-from math import ceil
 from os.path import abspath, join, split
 
+from . import _cache, _columnar, _cycles, _hp, _manifest, _moments, _panel, _parallel, _render
+from ._cache import cached, cache_clear, cache_info, lookup, set_cache
+from ._manifest import verify_data
+from ._registry import DatasetSpec, register, register_dataset
+from . import _registry
+from ._hp import TrendTracker
+from ._tools import see, xvalues
+
 
 # ===== Definitions ===========================================================
 
-jpn_yr_definitions = """
-    | `gdp`:          国内総生産（支出側GDP）
-    | `consumption`:  消費
-    | `investment`:   投資
-    | `government`:   政府支出
-    | `exports`:      輸出
-    | `imports`:      輸入
-    | `gdp_gap`:      GDPギャップ
-    | `deflator`:     GDPデフレーター
-    | `inflation`:    インフレ率
-    | `unemployment_rate`: 失業率
-    | `employed`:     就業者数
-    | `population`:   人口
-    | `gov_debt`:     政府負債
-    | `gov_net_debt`: 政府純負債
-    |
-    | * 年次データ（暦年）
-    |
-    | ＜出典＞
-    | GDPと各需要項目
-    |    * 1994年~
-    |        * 実額、暦年
-    |        * 連鎖価格
-    |        * 参照年：2015暦年（平成27年）
-    |        * 単位：10億円
-    |        * 国民経済計算（GDP統計）
-    |    * 1980年~1993年
-    |        * 実額、暦年
-    |        * 2015年（平成27年）基準支出側GDP系列簡易遡及（参考系列であり上のデータと接続可能）
-    |        * 単位：10億円
-    |        * 国民経済計算（GDP統計）
-    |
-    | GDPギャップ
-    |   * 単位：％
-    |   * GDPの潜在GDPからの乖離
-    |   * IMF World Economic Outlook
-    |
-    | GDPデフレーター
-    |   * IMF World Economic Outlook
-    |
-    | インフレ率
-    |   * 単位：％
-    |   * 年平均
-    |   * IMF World Economic Outlook
-    |
-    | 失業率
-    |   * 単位：％
-    |   * IMF World Economic Outlook
-    |
-    | 就業者数
-    |   * 単位：万人
-    |   * IMF World Economic Outlook
-    |
-    | 人口
-    |   * 単位：万人
-    |   * IMF World Economic Outlook
-    |
-    | 政府負債
-    |   * 単位：10億円
-    |   * IMF World Economic Outlook
-    |
-    | 政府純負債
-    |   * 単位：10億円
-    |   * IMF World Economic Outlook"""
-
-
-jpn_q_definitions = """
-    | `gdp`:         国内総生産（GDP）
-    | `consumption`: 消費
-    | `investment`:  投資
-    | `government`:  政府支出
-    | `exports`:     輸出
-    | `imports`:     輸入
-    | `capital`:     資本ストック
-    | `employed`:    就業者数
-    | `unemployed`:  失業者数
-    | `unemployment_rate`: 失業率
-    | `hours`:       労働者一人当たり月平均労働時間
-    | `total_hours`: 月平均総労働時間（`employed`X`hours`）
-    | `inflation`:   インフレ率
-    | `price`:       消費者物価指数
-    | `deflator`:    GDPデフレーター
-    |
-    | * 四半期データ
-    |
-    | ＜出典＞
-    | GDPと各需要項目
-    |    * 1994年Q1~2023年Q4
-    |        * 実額・四半期・実質季節調整系列（年換算）
-    |        * 連鎖価格
-    |        * 参照年：2015年（平成27年）
-    |        * 単位：10億円
-    |        * 国民経済計算（GDP統計）
-    |    * 1980年Q1~1993年Q4
-    |        * 実額・四半期・実質季節調整系列（年換算）
-    |        * 平成27年基準支出側GDP系列簡易遡及（参考系列であり上のデータと接続可能）
-    |        * 単位：10億円
-    |        * 国民経済計算（GDP統計）
-    |
-    | 実質資本ストック
-    |   * 1994年Q1~2023年Q4
-    |        * 平成25年基準
-    |        * 単位：10億円
-    |        * 国民経済計算（GDP統計）
-    |   * 1980年Q1~1993年Q4
-    |        * 平成25年基準遡及系列
-    |        * 単位：10億円
-    |        * 国民経済計算（GDP統計）
-    |   * 簡便的な移動平均を使い季節調整を施している
-    |
-    | 就業者数，失業者数，失業率
-    |   * 総務省「労働力調査」
-    |   * 単位：万人，％
-    |
-    | 労働者一人当たり月平均労働時間
-    |   * 厚生労働省「毎月勤労統計調査」
-    |   * 30 人以上(一般・パート)、月間実労働時間(総実労働時間)
-    |   * 2020年の平均を100に基準化
-    |
-    | インフレ率
-    |   * 景気動向指数（生鮮食品を除く総合，速報，改訂値，月次，原数値の前年同月比）から四半期平均として計算
-    |
-    | 消費者物価指数
-    |   * 2020年基準
-    |   * 「中分類指数（全国）＜時系列表＞【月次】」の四半期平均として計算
-    |   * 簡便的な移動平均を使い季節調整を施している
-    |
-    | GDPデフレーター
-    |   * 1994年Q1~2023年Q4
-    |       * 2015年（平成27年）基準
-    |       * 季節調整系列
-    |   * 1980年Q1~1993年Q4
-    |       * 2015年（平成27年）基準遡及系列
-    |       * 季節調整系列"""
-
-jpn_money_definitions = """
-    | `cpi`: 消費者物価指数
-    |   * 2015年の値を`100`
-    |   * 季節調整済み
-    | `money`: マネーストック（M1）
-    |   * 2015年の値を`100`
-    |   * 季節調整済み
-    |
-    | * 月次データ
-    | * 1955年1月〜2020年12月
-    |
-    | ＜出典＞
-    | OECD Main Economic Indicators"""
-
-world_money_definitions = """
-    | `iso`:          ISO国コード
-    | `country`:      国名
-    | `year`:         年
-    | `income_group`: 世界銀行が定義する所得グループ
-    |   * High income
-    |   * Upper Middle income
-    |   * Lower Middle income
-    |   * Low income
-    | `money`:        マネーストック（M1）
-    | `deflator`:     GDPディフレーター
-    |
-    | * 年次データ
-    |
-    | ＜注意点＞
-    | * `money`と`deflator`が10年間以上連続で欠損値がない経済（177ヵ国）のみが含まれている。
-    | * 国によって含まれるデータの`year`が異なる。
-    | * 所得グループに関する情報
-    |   https://datahelpdesk.worldbank.org/knowledgebase/articles/906519-world-bank-country-and-lending-groups
-    |
-    | ＜出典＞
-    | World Bank Development Indicators"""
-
-ex_definitions = """
-    | `real_ex_geus_%change`: 独マルク/米ドル実質為替レート変動率（％）
-    |                           * 月次，季節調整ない
-    | `real_ex_jpus_%change`: 円/米ドル実質為替レート変動率（％）
-    |                           * 月次，季節調整ない
-    | `real_ex_jpus`:         円/米ドル実質為替レート
-    |                           * 月次，季節調整ない
-    | `ex_jpus`:              円/米ドル名目為替レート
-    |                           * 月次，季節調整ない
-    | `relative_p_jpus`:      日本の一般物価水準に対しての米国の一般物価水準の比率
-    |                           * 日本のCPI分の米国のCPI
-    |                           * 2015年CPI=100
-    |                           * 月次，季節調整ない
-    |
-    | * 月次データ
-    | * 期間：1960年1月〜
-    |
-    | ＜出典＞
-    | OECD Main Economic Indicators"""
-
-dates_definitions = """
-    | `tani1`:       １つの循環における第１の谷
-    | `yama`:        １つの循環における山
-    | `tani2`:       １つの循環における第２の谷
-    | `expansion`:   拡張期の期間（単位：月）
-    |                `tani1`から`yama`までの期間
-    | `contraction`: 後退期の期間（単位：月）
-    |                `yama`から`tani2`までの期間
-    |
-    | ＜出典＞
-    | 内閣府
-    | https://www.esri.cao.go.jp/jp/stat/di/hiduke.html"""
-
-bigmac_definitions = """
-    | `year`:          年（2000年〜）
-    | `country`:       国名
-    | `iso`:           ISO国コード
-    | `currency_code`: 通貨コード
-    | `price_local`:   Big Macの価格（自国通貨単位）
-    | `exr`:           名目為替レート（自国通貨単位/米ドル）
-    | `gdppc_local`:   名目一人当たりGDP（自国通貨単位）
-    |
-    | * 年次データ
-    |
-    | ＜出典＞
-    | https://github.com/TheEconomist/big-mac-data (Copyright The Economist)"""
-
-mad_definitions = """
-    | `GDP pc`:        Real GDP per capita in 2011$
-    | `Population`:    Population, mid-year (thousands)
-    | `Regional data`: Regional GDP per capita and population estimates
-    |
-    | * `GDP pc`が欠損値の行は全て削除している。
-    |
-    | ＜出典＞
-    | Maddison Project Database 2023
-    |
-    | https://www.rug.nl/ggdc/historicaldevelopment/maddison/releases/maddison-project-database-2023
-    |
-    | Bolt, Jutta, and Jan Luiten van Zanden (2024) "Maddison-style estimates of
-    | the evolution of the world economy: A new 2023 update." Journal of Economic
-    | Surveys, pp.1-41."""
-
-debts_definitions = """
-    | `countrycode`:      ISO3国名コード
-    | `country`:          国名
-    | `year`:             年
-    | `revenue`:          Government revenue, percent of GDP
-    | `expenditure`:      Government expenditure, percent of GDP
-    | `interest_exp`:     Government interest expense, percent of GDP
-    | `prim_expenditure`: Government primary expenditure, percent of GDP
-    | `prim_balance`:     Government primary balance, percent of GDP
-    | `debt`:             Government gross debt, percent of GDP
-    | `rltir`:            Real long-term interest rate, percent
-    | `rgc`:              Real GDP growth rate, percent
-    | `GG_budg`:          sector coverage indicator for rev, exp, ie (0 for central gov't, 1 for general gov't)
-    | `GG_debt`:          sector coverage indicator for debt (0 for central gov't, 1 for general gov't)
-    |
-    | ＜出典＞
-    | Public Finances in Modern History
-    | https://www.imf.org/external/datamapper/datasets/FPP"""
+from ._definitions import (
+    jpn_yr_definitions,
+    jpn_q_definitions,
+    jpn_money_definitions,
+    world_money_definitions,
+    ex_definitions,
+    dates_definitions,
+    bigmac_definitions,
+    mad_definitions,
+    debts_definitions,
+    inequality_definitions)
+
 
 # ===== Helper functions ======================================================
 
@@ -276,66 +42,885 @@ def _find_full_file_path(path, dataset_to_open):
         dataset_to_open: dataset to open
 
     return:
-        a full file path of `dataset_to_open` including its file name"""
+        a full file path of `dataset_to_open` including its file name
+
+    Files listed in the manifest (`data/manifest.json`) are resolved without
+    touching the file system; `os.walk()` is only used for other files."""
+
+    if os.path.isabs(dataset_to_open):
+        return dataset_to_open
+
+    full_file_path = _manifest.file_path(dataset_to_open)
+    if full_file_path is not None:
+        return full_file_path
 
     for current_folder, sub_folders, _files in os.walk(path):
         if dataset_to_open in _files:
             return os.path.join(current_folder, dataset_to_open)
 
 
+def _blank_index_name(df):
+    df.index.name = ''
+    return df
+
+
+def _pwt_definitions(df):
+    df = df.iloc[:, [0, 1]].dropna(subset=['Variable name']
+                                    ).set_index('Variable name')
+    df.index.name = ''
+    return df
+
+
+def _normalize_pushdown(columns, countries, years):
+    """
+    Check and normalize the `columns`, `countries` and `years` arguments of `data()`.
+
+    return:
+        None if nothing is requested, otherwise a hashable tuple
+        (columns, countries, years) where
+            columns: tuple of column names or None
+            countries: sorted tuple of country codes or None
+            years: ('range', start, end) with None for an open end,
+                   ('in', sorted tuple of years) or None
+
+    Sorted tuples (not sets) are used so that the key does not depend on
+    the order of the arguments nor on the hash seed of the process."""
+
+    if (columns is None) and (countries is None) and (years is None):
+        return None
+
+    if columns is not None:
+        columns = (columns,) if isinstance(columns, str) else tuple(columns)
+
+    if countries is not None:
+        countries = tuple(sorted(set([countries] if isinstance(countries, str) else countries)))
+
+    if years is not None:
+        if isinstance(years, (int, np.integer)):
+            years = ('range', int(years), int(years))
+        elif isinstance(years, tuple) and (len(years) == 2):
+            years = ('range',) + tuple(None if y is None else int(y) for y in years)
+        else:
+            years = ('in', tuple(sorted(set(int(y) for y in years))))
+
+    return columns, countries, years
+
+
+def _country_column(columns):
+    for c in ('countrycode', 'iso'):
+        if c in columns:
+            return c
+    raise ValueError("このデータ・セットには国コードの列がないため，countriesは使えません。")
+
+
+def _row_mask(df, countries, years):
+    """Boolean array selecting the rows of `df` matching `countries` and `years`."""
+
+    mask = np.ones(len(df), dtype=bool)
+
+    if countries is not None:
+        mask &= df[_country_column(df.columns)].isin(countries).to_numpy()
+
+    if years is not None:
+        if 'year' in df.columns:
+            yr = df['year'].to_numpy()
+        elif isinstance(df.index, pd.DatetimeIndex):
+            yr = df.index.year.to_numpy()
+        else:
+            raise ValueError("このデータ・セットには年の列がないため，yearsは使えません。")
+
+        if years[0] == 'range':
+            _, start, end = years
+            if start is not None:
+                mask &= yr >= start
+            if end is not None:
+                mask &= yr <= end
+        else:
+            mask &= np.isin(yr, list(years[1]))
+
+    return mask
+
+
+def _select(df, keys, pushdown):
+    """Apply `pushdown` to an already loaded DataFrame (used on cache hits)."""
+
+    columns, countries, years = pushdown
+
+    df = df.loc[_row_mask(df, countries, years)]
+
+    if columns is not None:
+        unknown = [c for c in columns if c not in df.columns]
+        if unknown:
+            raise ValueError(f"次の列はデータ・セットに含まれていません：{unknown}")
+        wanted = set(keys) | set(columns)
+        df = df.loc[:, [c for c in df.columns if c in wanted]]
+
+    return df
+
+
+def _smallest_int(s):
+    """Smallest nullable integer dtype which can hold the values of `s`."""
+
+    lo, hi = s.min(), s.max()
+    for dtype, info in (('Int8', np.iinfo(np.int8)),
+                        ('Int16', np.iinfo(np.int16)),
+                        ('Int32', np.iinfo(np.int32))):
+        if pd.isna(lo) or ((info.min <= lo) and (hi <= info.max)):
+            return dtype
+    return 'Int64'
+
+
+def _compact_plan(df):
+    """
+    Memory-efficient dtypes of the columns of the full dataset `df`.
+
+    return:
+        dictionary column -> dtype
+            string columns with repeated values -> CategoricalDtype with the
+                categories of the whole column
+            integer columns (e.g. `year`, `oecd`) -> smallest nullable integer
+                holding the whole column"""
+
+    plan = {}
+    for c in df.columns:
+        s = df[c]
+        if (pd.api.types.is_object_dtype(s.dtype) or pd.api.types.is_string_dtype(s.dtype)):
+            if s.nunique() <= len(s) // 2:
+                plan[c] = pd.CategoricalDtype(s.astype('category').cat.categories)
+        elif pd.api.types.is_integer_dtype(s.dtype):
+            plan[c] = _smallest_int(s)
+    return plan
+
+
+def _compact(df, compact, plan):
+    """
+    Memory-efficient dtypes.
+
+    parameters:
+        df: DataFrame (the full dataset or some of its rows and columns)
+        compact:
+            False: return `df` as it is
+            True: apply `plan`
+            'float32': in addition, float64 columns -> float32
+        plan: return value of `_compact_plan()` for the full dataset, so that
+              the dtypes do not depend on the rows of `df`
+
+    return:
+        DataFrame"""
+
+    if not compact:
+        return df
+
+    dtypes = {c: plan[c] for c in df.columns if c in plan}
+    if compact == 'float32':
+        dtypes.update({c: np.float32 for c in df.columns
+                       if (c not in plan) and (df[c].dtype == np.float64)})
+
+    return df.astype(dtypes)
+
+
+def _parse_csv(spec, full_file_path):
+    """Parse the CSV file of `spec` and apply `spec.post` (no cache, no converted file)."""
+
+    df = pd.read_csv(full_file_path, **spec.read_kwargs)
+    return df if spec.post is None else spec.post(df)
+
+
+def _pushdown_columns(header, keys, pushdown, index_col=None):
+    """
+    parameters:
+        header: columns of the dataset
+        keys: identifier columns of the dataset
+        pushdown: return value of `_normalize_pushdown()`
+        index_col: `index_col` argument of `pd.read_csv()`
+
+    return:
+        set of the columns to read (None: all columns)"""
+
+    columns, countries, years = pushdown
+    if columns is None:
+        return None
+
+    unknown = [c for c in columns if c not in header]
+    if unknown:
+        raise ValueError(f"次の列はデータ・セットに含まれていません：{unknown}")
+    wanted = set(keys) | set(columns)
+    if index_col is not None:
+        wanted.add(index_col)
+    if countries is not None:
+        wanted.add(_country_column(header))
+    if (years is not None) and ('year' in header):
+        wanted.add('year')
+    return wanted
+
+
+def _data_files(spec):
+    """
+    return:
+        (full path of the CSV file, path of the converted Feather file or None)"""
+
+    full_file_path = _find_full_file_path(_get_path(__file__), spec.file)
+    converted = _columnar.find(full_file_path) if _BUILTIN.get(spec.name) is spec else None
+    return full_file_path, converted
+
+
+def _csv_kwargs(spec, full_file_path, pushdown):
+    """
+    Arguments of `pd.read_csv()` parsing only the columns needed for `pushdown`.
+
+    The string columns listed in the manifest are read as strings, so that
+    the dtypes do not depend on the rows of a chunk (a chunk in which a
+    string column is empty would otherwise give float64)."""
+
+    kwargs = spec.read_kwargs
+    read_kwargs = dict(kwargs)
+
+    dtypes = _manifest.file_dtypes(spec.file)
+    if (dtypes is not None) and ('thousands' not in kwargs):
+        skip = {kwargs.get('index_col')} | set(kwargs.get('dtype', {}))
+        if isinstance(kwargs.get('parse_dates'), list):
+            skip |= set(kwargs['parse_dates'])
+        # pandas 3は'str'，pandas 2は'object'と記録する
+        strings = {c: 'str' for c, t in dtypes.items()
+                   if (t in ('str', 'object')) and (c not in skip)}
+        if strings:
+            read_kwargs['dtype'] = {**strings, **kwargs.get('dtype', {})}
+
+    if (pushdown is None) or (pushdown[0] is None):
+        return read_kwargs
+
+    header = pd.read_csv(full_file_path, nrows=0,
+                         compression=kwargs.get('compression', 'infer')).columns
+    wanted = _pushdown_columns(header, spec.keys, pushdown, kwargs.get('index_col'))
+    read_kwargs['usecols'] = lambda c: c in wanted
+    if isinstance(kwargs.get('parse_dates'), list):
+        read_kwargs['parse_dates'] = [c for c in kwargs['parse_dates'] if c in wanted]
+    return read_kwargs
+
+
+def _read_csv(spec, pushdown=None, compact=False, chunksize=5000):
+    """
+    parameters:
+        spec: DatasetSpec of the dataset
+        pushdown: return value of `_normalize_pushdown()`
+        compact: False, True or 'float32' (see `_compact()`)
+        chunksize: number of rows parsed at once when rows are filtered
+
+    return:
+        DataFrame (a copy of the cached one after the first call)
+
+    With `pushdown`, only the requested columns are parsed (`usecols`) and
+    the rows are filtered chunk by chunk, so that the full dataset is never
+    held in memory. If the full dataset is already cached, or if disk
+    snapshots are enabled, the full dataset is sliced instead.
+
+    The bundled datasets are read from their converted Feather files when
+    they exist (see `_columnar.py`), otherwise from the CSV files.
+
+    With `compact`, the dtypes are taken from the full dataset (see
+    `_compact_plan()`), which is read once per version of the file if it is
+    not cached, so that every query gets the same dtypes and categories."""
+
+    dataset, file_name = spec.name, spec.file
+    post, keys = spec.post, spec.keys
+
+    full_file_path, converted = _data_files(spec)
+    source = full_file_path if converted is None else converted
+
+    def plan(df=None):
+        # 圧縮したデータ型はデータ・セット全体から一度だけ決める
+        def build():
+            full = df if df is not None else lookup((dataset, file_name), source)
+            if full is None:
+                full = (_columnar.read(converted) if converted is not None
+                        else _parse_csv(spec, full_file_path))
+            return _compact_plan(full)
+
+        return _cache.derived((dataset, file_name, 'compact'), source, build)
+
+    key = (dataset, file_name)
+    if compact:
+        key += (('compact', compact),)
+
+    if pushdown is None:
+
+        def reader():
+            df = (_columnar.read(converted) if converted is not None
+                  else _parse_csv(spec, full_file_path))
+            return _compact(df, compact, plan(df) if compact else None)
+
+        return cached(key, source, reader)
+
+    full = lookup(key, source)
+    if (full is None) and _cache.persistent():
+        # ディスクのスナップショットは全体のみ保存し，それを選択する
+        full = _read_csv(spec, None, compact)
+    if full is not None:
+        return _select(full, keys, pushdown)
+
+    full = lookup((dataset, file_name), source) if compact else None
+    if full is not None:
+        return _compact(_select(full, keys, pushdown), compact, plan(full))
+
+    def reader():
+        columns, countries, years = pushdown
+
+        if converted is not None:
+            # 変換したファイルは必要な列のみを読み込み，後処理も適用済み
+            wanted = _pushdown_columns(_columnar.columns(converted)[0], keys, pushdown)
+            df = _columnar.read(converted, wanted)
+            return _compact(df.loc[_row_mask(df, countries, years)], compact,
+                            plan() if compact else None)
+
+        read_kwargs = _csv_kwargs(spec, full_file_path, pushdown)
+        if (countries is None) and (years is None):
+            df = pd.read_csv(full_file_path, **read_kwargs)
+        else:
+            with pd.read_csv(full_file_path, chunksize=chunksize, **read_kwargs) as chunks:
+                df = pd.concat([chunk.loc[_row_mask(chunk, countries, years)]
+                                for chunk in chunks])
+
+        return _compact(df if post is None else post(df), compact,
+                        plan() if compact else None)
+
+    return cached(key + (pushdown,), source, reader, persist=False)
+
+
 # ===== Non-data-related functions ============================================
 
 
-def trend(s, lamb=1600):
+def _panel_positions(df, by):
+    """
+    Row positions of each group of `df` (ordered by `year` if it exists).
+
+    return:
+        list of integer arrays"""
+
+    if by is None:
+        return [np.arange(len(df))]
+
+    positions = list(df.groupby(by, sort=False, observed=True).indices.values())
+
+    if 'year' in df.columns:
+        year = df['year'].to_numpy()
+        positions = [p[np.argsort(year[p], kind='stable')] for p in positions]
+
+    return positions
+
+
+def _float_columns(df, by):
+    """Columns of a panel `df` to be filtered: float columns other than `by` and 'year'."""
+
+    return [c for c in df.columns
+            if (c not in (by, 'year')) and pd.api.types.is_float_dtype(df[c])]
+
+
+def _float_matrix(df, columns):
+    """(rows, len(columns)) float array of `columns` (missing values are NaN)."""
+
+    if not columns:
+        return np.empty((len(df), 0))
+    return np.column_stack([df[c].to_numpy(dtype=float, na_value=np.nan) for c in columns])
+
+
+def _finite_rows(s):
+    """`s` (Series or one-column DataFrame) without the rows which are NaN or ±inf."""
+
+    values = s.to_numpy(dtype=float, na_value=np.nan).reshape(len(s), -1)
+    return s[np.isfinite(values).all(axis=1)]
+
+
+def _replace_columns(df, columns, out):
+    """Copy of `df` with `columns` replaced by the columns of the array `out`."""
+
+    result = df.copy()
+    for j, c in enumerate(columns):
+        result[c] = out[:, j]
+    return result
+
+
+def _trend_frame(df, lamb, engine, by=None, columns=None, n_jobs=1, onesided=False):
+    """
+    HP trends of the columns of `df` (each group of `by` separately).
+
+    NaN and ±inf (e.g. `np.log(0)`) are dropped from each series before
+    filtering and left as NaN in the result. All series are solved together by `_hp.trend_panel()`, or
+    by a process pool when `n_jobs` is not 1.
+
+    parameters:
+        df: DataFrame
+        columns: columns to be filtered (the other columns are returned as they are)
+        n_jobs: number of processes (1: no process pool, -1: all CPUs)
+        onesided: if True, one-sided (Kalman filter) trends
+
+    return:
+        DataFrame with the same index and columns as `df`"""
+
+    positions = _panel_positions(df, by)
+    x = _float_matrix(df, columns)
+
+    if _parallel.n_workers(n_jobs) == 1:
+        out = _hp.trend_panel(x, positions, lamb, engine, onesided=onesided)
+    else:
+        out = _parallel.trend_panel(x, positions, lamb, engine, n_jobs, onesided)
+
+    return _replace_columns(df, columns, out)
+
+
+def trend(s, lamb=1600, engine=None, by=None, n_jobs=1, onesided=False):
     """|
        | 引数:
-       |     s: Seriesもしくは１列のDataFrameとし，行のラベルはDatetimeIndexとすること。
+       |     s: Series，DataFrameもしくはパネル・データのDataFrame
+       |        行のラベルはDatetimeIndexとすること（パネル・データを除く）。
        |     lamb: 四半期用のデータでは通常の値（デフォルト：1600）
+       |     engine: 計算方法（デフォルト：None）
+       |         None: 内蔵のHPフィルター（`scipy`があれば使い，なければ`numpy`のみ）
+       |         'scipy': 帯行列のCholesky分解（`scipy`が必要）
+       |         'numpy': LDL分解（`numpy`のみ，Pythonのループのため長い系列では遅い）
+       |         'statsmodels': `statsmodels`の`hpfilter()`
+       |     by: パネル・データのグループを表す列名（例：'countrycode'，デフォルト：None）
+       |         * グループ毎に`year`の順番でトレンドを計算する
+       |         * `by`と`year`以外の浮動小数点数の列のトレンドを計算する
+       |     n_jobs: パネル・データを計算するプロセスの数（デフォルト：1）
+       |         * -1の場合は全てのCPUを使う
+       |         * グループ（国など）毎にプロセスに分けて計算する（結果はn_jobs=1と同じ）
+       |         * Windowsとmacでは`if __name__ == '__main__':`の中で使う必要がある
+       |     onesided: Trueの場合，片側（リアルタイム）HPフィルターを使う（デフォルト：False）
+       |         * t期のトレンドはt期までのデータのみを使い計算される（カルマン・フィルター）
+       |         * 新しいデータを１期ずつ追加する場合は`TrendTracker`を使う
+       |
+       | 返り値:
+       |     Hodrick-Prescott filterで計算したtrend（トレンド）
+       |         * Seriesもしくは１列のDataFrameの場合：Series（欠損値の行は削除される）
+       |         * ２列以上のDataFrameの場合：各列のトレンドのDataFrame（欠損値はそのまま）
+       |         * パネル・データの場合：浮動小数点数の列をトレンドに置き換えたDataFrame
+       |
+       |     ±inf（`np.log(0)`など）は欠損値と同じく除いて計算される。
+       |     欠損値がある期間が異なる系列も，観測値の数が同じであればまとめて計算される。
+       |
+       | 例１: py4macro.trend(df.loc[:,'gdp'])
+       |
+       | 例２: py4macro.trend(py4macro.data('jpn-q'))
+       |
+       | 例３: py4macro.trend(py4macro.data('pwt', columns=['rgdpna', 'pop']),
+       |                      lamb=100, by='countrycode')"""
+
+    if onesided and (engine == 'statsmodels'):
+        raise ValueError("onesided=Trueの場合はengine='statsmodels'を使えません。")
+
+    if by is not None:
+        return _trend_frame(s, lamb, engine, by=by, columns=_float_columns(s, by),
+                            n_jobs=n_jobs, onesided=onesided)
+
+    if isinstance(s, pd.DataFrame) and (s.shape[1] != 1):
+        return _trend_frame(s, lamb, engine, columns=list(s.columns), n_jobs=n_jobs,
+                            onesided=onesided)
+
+    if engine == 'statsmodels':
+        from statsmodels.tsa.filters.hp_filter import hpfilter
+
+        return hpfilter(s.dropna(), lamb=lamb)[1]
+
+    s = _finite_rows(s)
+
+    # statsmodelsと同じ名前を付ける
+    name = getattr(s, 'name', None) if isinstance(s, pd.Series) else None
+    name = 'trend' if name is None else f'{name}_trend'
+
+    if isinstance(s, pd.DataFrame):
+        s = s.iloc[:, 0]
+
+    y = s.to_numpy(dtype=float)
+    values = _hp.onesided_trend(y, lamb) if onesided else _hp.hp_trend(y, lamb, engine)
+
+    return pd.Series(values, index=s.index, name=name)
+
+
+_CYCLE_METHODS = ('hp', 'hamilton', 'bk', 'cf')
+
+
+def cycle(s, method='hp', lamb=1600, h=8, p=4, low=6, high=32, K=12, drift=True,
+          engine=None, by=None):
+    """|
+       | 引数:
+       |     s: Series，DataFrameもしくはパネル・データのDataFrame（`trend()`と同じ）
+       |     method: フィルター（デフォルト：'hp'）
+       |         'hp': Hodrick-Prescottフィルター（引数：lamb，engine）
+       |         'hamilton': Hamilton (2018)の回帰フィルター（引数：h，p）
+       |         'bk': Baxter-Kingのバンドパス・フィルター（引数：low，high，K）
+       |         'cf': Christiano-Fitzgeraldのバンドパス・フィルター（引数：low，high，drift）
+       |     lamb: HPフィルターのlambda（デフォルト：1600）
+       |     h: Hamiltonフィルターの予測期間（デフォルト：8，年次データの場合は2）
+       |     p: Hamiltonフィルターのラグの数（デフォルト：4）
+       |     low: バンドパス・フィルターの周期の下限（デフォルト：6，年次データの場合は2）
+       |     high: バンドパス・フィルターの周期の上限（デフォルト：32，年次データの場合は8）
+       |     K: Baxter-Kingフィルターの移動平均の前後の期間（デフォルト：12，年次データの場合は3）
+       |     drift: Trueの場合，Christiano-Fitzgeraldフィルターの前にドリフトを除く（デフォルト：True）
+       |     engine: HPフィルターの計算方法（`trend()`と同じ，デフォルト：None）
+       |     by: パネル・データのグループを表す列名（例：'countrycode'，デフォルト：None）
        |
        | 返り値:
-       |     Hodrick-Prescott filterで計算したtrend（トレンド）のSeries
+       |     景気循環成分（`trend()`と同じ形）
+       |         * Seriesもしくは１列のDataFrameの場合：Series（欠損値の行は削除される）
+       |         * ２列以上のDataFrameの場合：各列の景気循環成分のDataFrame
+       |         * パネル・データの場合：浮動小数点数の列を景気循環成分に置き換えたDataFrame
        |
-       | 例: py4macro.trend(df.loc[:,'gdp'])"""
+       |     'hamilton'の最初のh+p-1期と'bk'の最初と最後のK期はNaNとなる。
+       |     ±inf（`np.log(0)`など）は欠損値と同じく除いて計算される。
+       |     観測値の数が同じ系列はまとめて計算される。
+       |
+       | 例１: py4macro.cycle(np.log(df['gdp']), method='hamilton')
+       |
+       | 例２: py4macro.cycle(py4macro.data('jpn-q'), method='bk')
+       |
+       | 例３: py4macro.cycle(py4macro.data('pwt', columns=['rgdpna']), method='cf',
+       |                      low=2, high=8, by='countrycode')"""
+
+    if method == 'hp':
+        func = functools.partial(_cycles.hp, lamb=lamb, engine=engine)
+    elif method == 'hamilton':
+        func = functools.partial(_cycles.hamilton, h=h, p=p)
+    elif method == 'bk':
+        func = functools.partial(_cycles.baxter_king, low=low, high=high, K=K)
+    elif method == 'cf':
+        func = functools.partial(_cycles.christiano_fitzgerald, low=low, high=high,
+                                 drift=drift)
+    else:
+        raise ValueError(f"methodには次のどれかを指定してください。\n{_CYCLE_METHODS}")
+
+    if by is not None:
+        columns = _float_columns(s, by)
+        out = _cycles.cycle_panel(_float_matrix(s, columns), _panel_positions(s, by), func)
+        return _replace_columns(s, columns, out)
+
+    if isinstance(s, pd.DataFrame) and (s.shape[1] != 1):
+        columns = list(s.columns)
+        out = _cycles.cycle_panel(_float_matrix(s, columns), _panel_positions(s, None), func)
+        return _replace_columns(s, columns, out)
+
+    s = _finite_rows(s)
+
+    name = getattr(s, 'name', None) if isinstance(s, pd.Series) else None
+    name = 'cycle' if name is None else f'{name}_cycle'
+
+    if isinstance(s, pd.DataFrame):
+        s = s.iloc[:, 0]
+
+    return pd.Series(func(s.to_numpy(dtype=float)), index=s.index, name=name)
+
+
+def cycle_stats(df, reference='gdp', lags=4, by=None):
+    """|
+       | 景気循環のモーメントの表を返す
+       |
+       | 引数:
+       |     df: 景気循環成分のDataFrameもしくはパネル・データのDataFrame（例：`cycle()`の返り値）
+       |     reference: 相対的な標準偏差と相互相関の基準となる列（デフォルト：'gdp'）
+       |     lags: リード・ラグの最大の期間k（デフォルト：4）
+       |     by: パネル・データのグループを表す列名（例：'countrycode'，デフォルト：None）
+       |         * グループ毎に`year`の順番でモーメントを計算する
+       |         * `by`と`year`以外の浮動小数点数の列のモーメントを計算する
+       |
+       | 返り値:
+       |     DataFrame（行は変数，パネル・データの場合は（グループ，変数））
+       |         'std': 標準偏差
+       |         'relative std': 基準となる列の標準偏差との比
+       |         'autocorr': １次の自己相関係数
+       |         'x(t-k)',...,'x(t)',...,'x(t+k)': x(t+j)と基準となる列のt期の値の相関係数
+       |             * 正のjで相関が高い場合，変数は基準となる列に遅行する
+       |             * `df[x].shift(-j).corr(df[reference])`と同じ（欠損値の期間は除かれる）
+       |
+       |     相互相関は全ての変数（とグループ）についてFFTを使いまとめて計算する。
+       |
+       | 例１: df = py4macro.data('jpn-q')
+       |       df = df.loc[:, (df > 0).all()]    # 対数を取れる正の値の列のみ（inflationを除く）
+       |       py4macro.cycle_stats(py4macro.cycle(np.log(df)))
+       |
+       | 例２: pwt = py4macro.data('pwt', columns=['rgdpna', 'rconna', 'emp'])
+       |       pwt[['rgdpna', 'rconna', 'emp']] = np.log(pwt[['rgdpna', 'rconna', 'emp']])
+       |       cyc = py4macro.cycle(pwt, lamb=100, by='countrycode')
+       |       py4macro.cycle_stats(cyc, reference='rgdpna', lags=2, by='countrycode')"""
+
+    if by is None:
+        columns = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])
+                   and not pd.api.types.is_bool_dtype(df[c])]
+    else:
+        columns = _float_columns(df, by)
+
+    if reference not in columns:
+        raise ValueError(f"referenceには次の列のどれかを指定してください。\n{columns}")
+
+    positions = _panel_positions(df, by)
+    x = _moments.stack_groups(_float_matrix(df, columns), positions)
+    m = _moments.moments(x, columns.index(reference), lags)
+
+    labels = [f'x(t{k:+d})' if k != 0 else 'x(t)' for k in range(-lags, lags + 1)]
+    values = np.concatenate([m['std'][:, :, None], m['relative std'][:, :, None],
+                             m['autocorr'][:, :, None], m['xcorr']], axis=2)
+    values = values.reshape(-1, values.shape[2])
 
-    from statsmodels.tsa.filters.hp_filter import hpfilter
+    if by is None:
+        index = pd.Index(columns, name='variable')
+    else:
+        groups = [df[by].iloc[p[0]] for p in positions]
+        index = pd.MultiIndex.from_product([groups, columns], names=[by, 'variable'])
+
+    return pd.DataFrame(values, index=index,
+                        columns=['std', 'relative std', 'autocorr'] + labels)
+
+
+def _page_html(df, page, page_size, hint=False):
+    """
+    HTML of one page of `df` followed by a summary footer.
+    Only the rows of the page are converted to HTML."""
+
+    n = len(df)
+    pages = max(1, -(-n // page_size))
+    page = min(max(int(page), 1), pages)
+    lo = (page - 1) * page_size
+    hi = min(lo + page_size, n)
+
+    with pd.option_context('display.max_colwidth', None,
+                           'display.max_rows', None):
+        table = df.iloc[lo:hi].to_html(notebook=True)
+
+    footer = f'{n:,}行 × {df.shape[1]:,}列のうち{lo+1:,}〜{hi:,}行目を表示（ページ {page}/{pages}）'
+    if hint and (pages > 1):
+        footer += f'。他のページは`py4macro.show(df, page=2)`などで表示できます'
+
+    return f'{table}<p style="font-size:90%;color:grey">{footer}</p>'
+
+
+def _page_widget(df, page, page_size):
+    """ipywidgets box showing one page of `df` with buttons to move between pages."""
+
+    import ipywidgets as widgets
 
-    return hpfilter(s.dropna(), lamb=lamb)[1]
+    pages = max(1, -(-len(df) // page_size))
+    html = widgets.HTML(_page_html(df, page, page_size))
+    selector = widgets.BoundedIntText(value=min(max(page, 1), pages), min=1, max=pages,
+                                      description='ページ', layout={'width': '160px'})
+    previous = widgets.Button(description='前', layout={'width': '60px'})
+    following = widgets.Button(description='次', layout={'width': '60px'})
 
+    def update(change):
+        html.value = _page_html(df, change['new'], page_size)
 
-def show(df):
+    def move(step):
+        selector.value = min(max(selector.value + step, 1), pages)
+
+    selector.observe(update, names='value')
+    previous.on_click(lambda _: move(-1))
+    following.on_click(lambda _: move(1))
+
+    return widgets.VBox([widgets.HBox([previous, selector, following]), html])
+
+
+def show(df, page=None, page_size=200, max_rows=2000, widget=False):
     """|
-       | 引数：DetaFrame
+       | 引数：
+       |     df: DataFrame
+       |     page: 表示するページ（1から始まる，デフォルト：None）
+       |         * Noneの場合，行数がmax_rows以下であれば全ての行を表示し，
+       |           max_rowsを超える場合は最初のページを表示する
+       |     page_size: １ページの行数（デフォルト：200）
+       |     max_rows: 全ての行を表示する行数の上限（デフォルト：2000）
+       |         * Noneの場合は行数に関わらず全ての行を表示する
+       |     widget: Trueの場合，ページを移動するボタンを表示する（`ipywidgets`が必要，デフォルト：False）
        |
        | 戻り値：行・列ともに全て表示する。
+       |     * ページ毎に表示する場合，そのページの行だけがHTMLに変換され，
+       |       最後に行数・列数と表示している行の範囲が表示される。
+       |
+       | 例１：py4macro.show(＜DataFrame＞)
        |
-       | 例：py4macro.show(＜DataFrame＞)"""
+       | 例２：py4macro.show(py4macro.data('pwt'), page=3)
+       |
+       | 例３：py4macro.show(py4macro.data('weo'), widget=True)"""
 
-    with pd.option_context('display.max_colwidth',
-                           None,
-                           'display.max_rows',
-                           None):
-        display(df)
+    paginate = (page is not None) or widget or \
+               ((max_rows is not None) and (len(df) > max_rows))
 
+    if not paginate:
+        with pd.option_context('display.max_colwidth',
+                               None,
+                               'display.max_rows',
+                               None):
+            display(df)
+        return
 
-def xvalues(low, high, number):
-    """引数
-        low：最小値（lowest value）
-        high：最大値（highest value）
-        number：作成する数値の数を指定する（正の整数型，number of values）
-    戻り値
-        number個の要素から構成されるリスト"""
-
-    if (number <= 1) or (not isinstance(number, int)):
-        raise Exception(f"引数 number には2以上の整数型を使う必要があります。number={number}となっています。")
-    elif low >= high:
-        raise Exception(
-            "引数 low と high の値では low>high もしくは low=high となります。low<high となるように値を設定し直してください。"
-        )
+    if (not isinstance(page_size, int)) or (page_size < 1):
+        raise ValueError(f"page_sizeには正の整数を指定してください。page_size={page_size}")
+
+    if widget:
+        display(_page_widget(df, 1 if page is None else page, page_size))
     else:
-        return [low + x*(high-low)/(number-1) for x in range(number)]
+        from IPython.display import HTML
+
+        display(HTML(_page_html(df, 1 if page is None else page, page_size,
+                                hint=page is None)))
 
 
-def fukyo(ax, start=1980, end=2999, color='k', alpha=0.1):
+@functools.lru_cache(maxsize=1)
+def _cycle_dates():
+    """
+    Business cycle dates parsed once per session.
+
+    return:
+        (years of the peaks, peaks, troughs) as read-only datetime64 arrays"""
+
+    df = _read_csv(_registry.get('dates'))
+    years = df['yama'].dt.year.to_numpy()
+    peaks = df['yama'].to_numpy()
+    troughs = df['tani2'].to_numpy()
+    for a in (years, peaks, troughs):
+        a.flags.writeable = False
+
+    return years, peaks, troughs
+
+
+def _as_periods(dates):
+    """
+    Peaks and troughs of a table of business cycle dates.
+
+    parameters:
+        dates: DataFrame with the columns 'peak' and 'trough' (or 'yama' and
+               'tani2' as in data('dates'), otherwise the first two columns),
+               IntervalIndex, or sequence of (peak, trough) pairs
+
+    return:
+        (peaks, troughs) as DatetimeIndex sorted by the peaks (rows with
+        missing dates are dropped)"""
+
+    if isinstance(dates, pd.IntervalIndex):
+        peaks, troughs = dates.left, dates.right
+    elif isinstance(dates, pd.DataFrame):
+        for cols in [('peak', 'trough'), ('yama', 'tani2'), tuple(dates.columns[:2])]:
+            if set(cols) <= set(dates.columns):
+                break
+        peaks, troughs = dates[cols[0]], dates[cols[1]]
+    else:
+        pairs = list(dates)
+        peaks, troughs = [p for p, _ in pairs], [t for _, t in pairs]
+
+    peaks = pd.DatetimeIndex(pd.to_datetime(np.asarray(peaks)))
+    troughs = pd.DatetimeIndex(pd.to_datetime(np.asarray(troughs)))
+    valid = ~(peaks.isna() | troughs.isna())
+    order = np.argsort(peaks[valid].asi8, kind='stable')
+
+    return peaks[valid][order], troughs[valid][order]
+
+
+def _recession_periods(start, end, dates=None):
+    """
+    Peaks and troughs of the recessions whose peak is in [start, end]
+    (Japanese business cycle dates if `dates` is None, see `_as_periods()`)."""
+
+    if dates is None:
+        years, peaks, troughs = _cycle_dates()
+    else:
+        peaks, troughs = _as_periods(dates)
+        years, peaks, troughs = peaks.year.to_numpy(), peaks.to_numpy(), troughs.to_numpy()
+
+    cond = (years >= start) & (years <= end)
+    return peaks[cond], troughs[cond]
+
+
+def cycle_phase(index, dates=None, closed='right', labels=('expansion', 'contraction')):
+    """|
+       | 時点毎に景気循環の局面（拡張期もしくは後退期）を返す
+       |
+       | 引数:
+       |     index: 時点（DatetimeIndex，PeriodIndex，日付のSeriesやリストなど）
+       |     dates: 山と谷の表（デフォルト：None）
+       |         * Noneの場合は内閣府の景気基準日付（`data('dates')`）
+       |         * 'peak'と'trough'の列があるDataFrame（ない場合は最初の２列を山，谷とする）
+       |         * IntervalIndex（各区間が後退期）
+       |         * (山, 谷)のリスト（例：NBERの日付，`trend()`から求めた局面）
+       |     closed: 後退期に含める端点（デフォルト：'right'）
+       |         'right': 山の翌期から谷まで（内閣府とNBERの定義）
+       |         'left'，'both'，'neither'も指定できる
+       |     labels: 拡張期と後退期のラベル（デフォルト：('expansion', 'contraction')）
+       |
+       | 返り値:
+       |     Categorical型のSeries（行ラベルは`index`）
+       |         * 最初の山より前の時点と欠損値はNaN
+       |
+       | 後退期の区間を並べたIntervalIndexに対して`searchsorted()`を使い，n個の時点をO(n log k)
+       | （kは後退期の数）で分類する。
+       |
+       | 例１: py4macro.cycle_phase(py4macro.data('jpn-q').index)
+       |
+       | 例２: nber = [('2007-12-01', '2009-06-01'), ('2020-02-01', '2020-04-01')]
+       |       py4macro.cycle_phase(pd.date_range('2000', '2024', freq='D'), dates=nber)"""
+
+    if closed not in ('right', 'left', 'both', 'neither'):
+        raise ValueError("closedには'right'，'left'，'both'，'neither'のどれかを指定してください。")
+
+    if dates is None:
+        _, peaks, troughs = _cycle_dates()
+    else:
+        peaks, troughs = _as_periods(dates)
+    intervals = pd.IntervalIndex.from_arrays(peaks, troughs, closed=closed)
+    if not intervals.is_non_overlapping_monotonic:
+        raise ValueError("後退期の区間が重なっています。")
+
+    if isinstance(index, pd.PeriodIndex):
+        t = index.to_timestamp()
+    else:
+        t = pd.DatetimeIndex(pd.to_datetime(np.asarray(index)))
+
+    left, right = intervals.left, intervals.right
+
+    # t以前（closed_leftの場合）もしくはtより前に始まる最後の後退期
+    side = 'right' if intervals.closed_left else 'left'
+    i = left.searchsorted(t, side=side) - 1
+    last = right[np.maximum(i, 0)] if len(right) else t
+    inside = (i >= 0) & ((t <= last) if intervals.closed_right else (t < last))
+
+    codes = inside.astype(np.int8)
+    codes[(t < left[0]) if len(left) else np.ones(len(t), dtype=bool)] = -1
+    codes[t.isna()] = -1
+
+    if isinstance(index, pd.Index):
+        result_index = index
+    elif isinstance(index, pd.Series):
+        result_index = index.index
+    else:
+        result_index = t
+    return pd.Series(pd.Categorical.from_codes(codes, categories=list(labels)),
+                     index=result_index, name='phase')
+
+
+def _shade(ax, starts, ends, color='k', alpha=0.1):
+    """
+    Shade the periods [starts[i], ends[i]] of `ax` with one PolyCollection.
+
+    The bands span the whole height of the axes (like `ax.axvspan()`) and the
+    x data limits are extended to include them."""
+
+    from matplotlib.collections import PolyCollection
+
+    if len(starts) == 0:
+        return None
+
+    x0 = np.asarray(ax.convert_xunits(list(starts)), dtype=float)
+    x1 = np.asarray(ax.convert_xunits(list(ends)), dtype=float)
+    zeros, ones = np.zeros_like(x0), np.ones_like(x0)
+    verts = np.stack([np.column_stack([x0, zeros]), np.column_stack([x0, ones]),
+                      np.column_stack([x1, ones]), np.column_stack([x1, zeros])], axis=1)
+
+    bands = PolyCollection(verts, facecolors=color, edgecolors='none', linewidths=0,
+                           alpha=alpha, transform=ax.get_xaxis_transform())
+    ax.add_collection(bands, autolim=False)
+    ax.update_datalim(np.column_stack([np.r_[x0, x1], np.zeros(2 * len(x0))]),
+                      updatey=False)
+    ax.autoscale_view(scaley=False)
+
+    return bands
+
+
+def fukyo(ax, start=1980, end=2999, color='k', alpha=0.1, dates=None):
     """
     * 横軸に`DatetimeIndex`を使うプロットに対して後退期間にグレーの塗りつぶしを追加する関数
     * `@py4macro.recessions`デコレーターとの違い
@@ -348,6 +933,9 @@ def fukyo(ax, start=1980, end=2999, color='k', alpha=0.1):
         end：`fukyo()`関数を適用し終わる年（デフォルトは`2999`）
         color：色（デフォルトは黒）
         alpha：透明度（デフォルトは`0.1）
+        dates：山と谷の表（デフォルトは`None`で内閣府の景気基準日付）
+            * `'peak'`と`'trough'`の列があるDataFrame，IntervalIndexもしくは(山, 谷)のリスト
+            * 例：NBERの日付や`trend()`から求めた局面（`cycle_phase()`を参照）
 
     戻り値：
         なし（表示のみ）
@@ -369,32 +957,17 @@ def fukyo(ax, start=1980, end=2999, color='k', alpha=0.1):
 
     ＜景気基準日付＞ https://www.esri.cao.go.jp/jp/stat/di/hiduke.html"""
 
-    full_file_path = _find_full_file_path(_get_path(__file__), 'cycle_dates.csv.bz2')
-    df = pd.read_csv(full_file_path,
-                     index_col='index',
-                     parse_dates=['tani1','yama','tani2'],
-                     compression="bz2",
-                     dtype={'expansion': 'Int64', 'contraction': 'Int64'})
-
-    if start < 1951:
+    if (dates is None) and (start < 1951):
         print('\n景気基準日付は1951年6月から始まります。\n')
-        
-    yr_lst = df['yama'].astype(str).str[:4].astype(int)
-    cond = ( yr_lst >= start ) & ( yr_lst <= end )
-    df = df.loc[cond,:].reset_index(drop=True)
-    
-    for i in df.index:
-        yama = df.loc[i, 'yama']
-        tani = df.loc[i, 'tani2']
-        ax.axvspan(yama, tani, fill=True, linewidth=0,
-                   color=color, alpha=alpha)
+
+    _shade(ax, *_recession_periods(start, end, dates), color=color, alpha=alpha)
     # return ax
 
 
 # ===== Decorator =============================================================
 
 
-def recessions(start=1980, end=2999, color='k', alpha=0.1):
+def recessions(start=1980, end=2999, color='k', alpha=0.1, dates=None):
     """
     * 横軸に`DatetimeIndex`を使うプロットに対して後退期間にグレーの塗りつぶしを追加するデコレーター
     * `fukyo()`関数との違い
@@ -406,6 +979,7 @@ def recessions(start=1980, end=2999, color='k', alpha=0.1):
         end：`fukyo()`関数を適用し終わる年（デフォルトは`2999`）
         color：色（デフォルトは黒）
         alpha：透明度（デフォルトは`0.1）
+        dates：山と谷の表（デフォルトは`None`で内閣府の景気基準日付，`fukyo()`と同じ）
 
     戻り値
         funcが返す軸を返す
@@ -442,202 +1016,196 @@ def recessions(start=1980, end=2999, color='k', alpha=0.1):
         ax[1].plot(...)
         return ax       # この行は必須"""
 
-    full_file_path = _find_full_file_path(_get_path(__file__), 'cycle_dates.csv.bz2')
-    df = pd.read_csv(full_file_path,
-                     index_col='index',
-                     parse_dates=['tani1','yama','tani2'],
-                     compression="bz2",
-                     dtype={'expansion': 'Int64', 'contraction': 'Int64'})
+    # 後退期間の(山, 谷)の組はデコレーターを適用する際に一度だけ計算する。
+    # 読み取り専用の配列であり，ラッパーは状態を変更しないため複数のスレッドから呼び出せる。
+    periods = np.column_stack(_recession_periods(start, end, dates))
+    periods.flags.writeable = False
 
     def _recessions(func):
 
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
 
-            import matplotlib.pyplot as plt
-
-            nonlocal df, start, end, color, alpha
-
-            if start < 1951:
+            if (dates is None) and (start < 1951):
                 print('\n景気基準日付は1951年6月から始まります。\n')
 
             ax = func(*args, **kwargs)
 
-            # 図が一つの場合，軸はそのまま返される
-            if not isinstance(ax, np.ndarray):
-
-                yr_lst = df['yama'].astype(str).str[:4].astype(int)
-                cond = ( yr_lst >= start ) & ( yr_lst <= end )
-                df = df.loc[cond,:].reset_index(drop=True)
-
-                for i in df.index:
-                    yama = df.loc[i, 'yama']
-                    tani = df.loc[i, 'tani2']
-                    plt.axvspan(yama, tani, fill=True, linewidth=0,
-                               color=color, alpha=alpha)
-
-                return ax
-
-            # 図が複数の場合，軸はarrayとして返される
-            # DataFrame.plot()で縦に並べる場合，軸は１次元配列となる
-            elif ax.ndim == 1:
-                n = len(ax)
-                for r in range(n):
-
-                    yr_lst = df['yama'].astype(str).str[:4].astype(int)
-                    cond = ( yr_lst >= start ) & ( yr_lst <= end )
-                    df = df.loc[cond,:].reset_index(drop=True)
-                    
-                    for i in df.index:
-                        yama = df.loc[i, 'yama']
-                        tani = df.loc[i, 'tani2']
-                        ax[r].axvspan(yama, tani, fill=True, linewidth=0,
-                                   color=color, alpha=alpha)
-
-                return ax
-
-            # 軸のarrayが2次元配列となる場合
-            elif ax.ndim > 1:
-                row = ax.shape[0]
-                col = ax.shape[1]
-                for r in range(row):
-                    for c in range(col):
-
-                        yr_lst = df['yama'].astype(str).str[:4].astype(int)
-                        cond = ( yr_lst >= start ) & ( yr_lst <= end )
-                        df = df.loc[cond,:].reset_index(drop=True)
-                        
-                        for i in df.index:
-                            yama = df.loc[i, 'yama']
-                            tani = df.loc[i, 'tani2']
-                            ax[r,c].axvspan(yama, tani, fill=True, linewidth=0,
-                                       color=color, alpha=alpha)
-                return ax
-
-        return wrapper
-
-    return _recessions
-
-
-# ===== see function (show attributes) =======================================
-
-
-def _create_template(obj, col, width):
-    """
-    表示用のテンプレートを作成する関数
-
-    引数：
-        obj: 属性を調べるオブジェクト
-        col: 表示する際の列の数
-        width: 表示の幅
-        　　　　　(列の幅は width/col 以上である最小整数となる)
-    戻り値：
-        テンプレートを含む辞書
-            値：任意の行の列
-            値：テンプレートのリスト
-
-
-    例：3つの列があり，表示全体の幅は20
-
-　　    _create_template(obj_x, col=3, width=20)
+            # 軸は一つの軸，１次元配列（DataFrame.plot()で縦に並べる場合）もしくは
+            # ２次元配列として返される。軸を返さない場合は現在の軸に追加する。
+            if ax is None:
+                import matplotlib.pyplot as plt
 
-       ＜実行結果＞
-        {1: ['{0:7}'], 2: ['{0:7}', '{0:7}'], 3: ['{0:7}', '{0:7}', '{0:7}']}
-
-        キー：表示される行に列が1つしかない場合，2つしかない場合，３つある場合を表す。
-        値：.format()関数に使い，文字列を代入するためのテンプレート
-            値にある0は .format()関数を使う際の位置引数の値
-            値にある7は各列の幅を表す
-        (注意) width=20は実行結果の7の計算に使われている。
-    """
-
-    # set width of each column
-    col_width = ceil(width/col)
+                axes = [plt.gca()]
+            else:
+                axes = np.ravel(ax)
 
-    # template for each column
-    temp = ["{" + str(0) + ":" + str(col_width) + "}"]
+            for a in axes:
+                _shade(a, periods[:, 0], periods[:, 1], color=color, alpha=alpha)
 
-    # create templates for rows
-    # with one column, two columns, three columns,...
-    template_dic = {}
+            return ax
 
-    for i in range(1, col+1):
+        return wrapper
 
-        template_dic[i] = temp * i
+    return _recessions
 
-    return template_dic
 
+# ===== Batch rendering =======================================================
 
-def see(obj, col=4, width=70):
-    """
-    オブジェクトの属性（`_`もしくは`__`が付いた属性以外）を表示する
-    メソッドは`()`が付いて表示される。
 
-    引数：
-        obj: 属性を調べるオブジェクト
-        col: 表示する際の列の数（デフォルトは4）
-        width: 表示の幅（デフォルトは70）
-        　　　　　(列の幅は width/col 以上である最小整数となる)
-    戻り値：
-        None (表示のみ)
+def render_many(specs, out_dir, n_jobs=-1, dpi=100):
+    """|
+       | 複数の図を作成しファイルに保存する（景気後退期間の塗りつぶし付き）
+       |
+       | 引数:
+       |     specs: 図の設定（辞書）のリスト
+       |         'dataset': データ・セット名（必須，例：'jpn-q'）
+       |         'file': ファイル名（必須，拡張子で形式が決まる，例：'gdp.png'，'gdp.svg'）
+       |         'columns': プロットする列名もしくはそのリスト（デフォルト：全ての列）
+       |         'start'，'end': プロットする期間（例：'1990'，デフォルト：全ての期間）
+       |         'title'，'ylabel': タイトルと縦軸のラベル
+       |         'figsize': 図の大きさ（デフォルト：(6.4, 4.8)）
+       |         'fukyo': 後退期間の塗りつぶし（デフォルト：True）
+       |             * Falseの場合は塗りつぶさない
+       |             * 辞書の場合は`fukyo()`の引数（例：{'color': 'grey', 'alpha': 0.2}）
+       |     out_dir: ファイルを保存するフォルダ（存在しない場合は作成される）
+       |     n_jobs: プロセスの数（デフォルト：-1）
+       |         * -1の場合は全てのCPUを使い，1の場合はプロセス・プールを使わない
+       |         * Windowsとmacでは`if __name__ == '__main__':`の中で使う必要がある
+       |     dpi: 解像度（デフォルト：100）
+       |
+       | 返り値:
+       |     図毎の結果のDataFrame（'file'，'dataset'，'seconds'，'pid'，'error'）
+       |         * エラーが発生した図は保存されず，'error'にエラーの内容が入る
+       |
+       | 各プロセスは最初にデータ・セットと景気循環日付を一度だけ読み込み，同じ大きさの図を
+       | 使い回す（`pyplot`は使わずAggで描く）。
+       |
+       | 例: specs = [{'dataset': 'jpn-q', 'columns': c, 'file': f'{c}.png'}
+       |              for c in ['gdp', 'consumption', 'investment']]
+       |     py4macro.render_many(specs, 'figures')"""
 
+    specs = list(specs)
+    _render.validate(specs)
+    os.makedirs(out_dir, exist_ok=True)
 
-    例：整数型である100の属性を調べる。
+    datasets = sorted({spec['dataset'] for spec in specs})
+    n = min(_parallel.n_workers(n_jobs), max(len(specs), 1))
+    render = functools.partial(_render.render, out_dir=out_dir, dpi=dpi)
 
-       see(100)
+    if n == 1:
+        _render.preload(datasets)
+        rows = [render(spec) for spec in specs]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
 
-       ＜実行結果＞
+        with ProcessPoolExecutor(n, initializer=_render.preload,
+                                 initargs=(datasets,)) as executor:
+            rows = list(executor.map(render, specs,
+                                     chunksize=max(1, len(specs) // (4 * n))))
 
-       .as_integer_ratio()  .bit_count()     .bit_length()    .conjugate()
-       .denominator         .from_bytes()    .imag            .is_integer()
-       .numerator           .real            .to_bytes()
-    """
+    return pd.DataFrame(rows, columns=['file', 'dataset', 'seconds', 'pid', 'error'])
 
-    lst = [i for i in dir(obj) if i[0] != "_"]
-    
-    # Prepare display names with () for callables
-    display_lst = []
-    for attr in lst:
-        try:
-            attr_val = getattr(obj, attr)
-            if callable(attr_val):
-                display_lst.append(attr + "()")
-            else:
-                display_lst.append(attr)
-        except Exception:
-            display_lst.append(attr)
 
-    # Determine max length of attribute string (after dot)
-    max_attr_len = max(len(attr) for attr in display_lst)
-    
-    # Format attributes with alignment at the dot
-    formatted_attrs = [f".{attr:<{max_attr_len}}" for attr in display_lst]
+# ===== Datasets ==============================================================
 
-    # Break into rows
-    new_lst = []
-    for i in range(ceil(len(formatted_attrs) / col)):
-        new_lst.append(formatted_attrs[i * col:i * col + col])
+# `_manifest.DATASET_FILES`も合わせて更新すること
 
-    # Set uniform column width
-    col_width = max_attr_len + 1  # plus 1 for dot
+_K3 = ('countrycode', 'country', 'year')
 
-    # Create templates
-    template = {i: [f"{{0:<{col_width}}}"] * i for i in range(1, col + 1)}
+register(DatasetSpec(
+    'bigmac', 'bigmac.csv.bz2', title='Big Macインデックス',
+    read_kwargs=dict(index_col='index', compression="bz2",
+                     dtype={'expansion': 'Int64', 'contraction': 'Int64'}),
+    post=_blank_index_name, keys=('year', 'country', 'iso'),
+    definitions=bigmac_definitions))
 
-    # Print formatted lines
-    for inner_lst in new_lst:
-        num = len(inner_lst)
-        line_str = ""
-        for idx, j in enumerate(template[num]):
-            line_str += j.format(inner_lst[idx]) + "  "
-        print(line_str.strip())
+register(DatasetSpec(
+    'debts', 'debts.csv.bz2',
+    title='Historical Debts Data (Public Finances in Modern History)',
+    read_kwargs=dict(compression="bz2"), keys=_K3,
+    definitions=debts_definitions))
 
+register(DatasetSpec(
+    'dates', 'cycle_dates.csv.bz2', title='景気循環日付など',
+    read_kwargs=dict(index_col='index', parse_dates=['tani1','yama','tani2'],
+                     compression="bz2",
+                     dtype={'expansion': 'Int64', 'contraction': 'Int64'}),
+    post=_blank_index_name, definitions=dates_definitions))
+
+register(DatasetSpec(
+    'ex', 'real_ex_rate.csv.bz2', title='円/ドル為替レートなど',
+    read_kwargs=dict(index_col='index', parse_dates=True, compression="bz2"),
+    post=_blank_index_name, definitions=ex_definitions))
+
+register(DatasetSpec(
+    'inequality', 'inequality.csv.bz2', title='所得・資産の分布とジニ係数',
+    read_kwargs=dict(index_col='index', compression="bz2"),
+    post=_blank_index_name, keys=('variable', 'percentile', 'year'),
+    definitions=inequality_definitions))
+
+register(DatasetSpec(
+    'jpn-money', 'jpn_money.csv.bz2', title='日本の四半期データ（マネーストックなど）',
+    read_kwargs=dict(index_col='date', parse_dates=True, compression="bz2"),
+    post=_blank_index_name, definitions=jpn_money_definitions))
+
+register(DatasetSpec(
+    'jpn-q', 'jpn_quarterly.csv.bz2', title='日本の四半期データ（GDPなど）',
+    read_kwargs=dict(index_col='index', parse_dates=True, compression="bz2"),
+    post=_blank_index_name, definitions=jpn_q_definitions))
+
+register(DatasetSpec(
+    'jpn-yr', 'jpn_annual.csv.bz2', title='日本の年次データ（GDPなど）',
+    read_kwargs=dict(index_col='index', parse_dates=True, compression="bz2"),
+    post=_blank_index_name, definitions=jpn_yr_definitions))
+
+register(DatasetSpec(
+    'mad', 'mad_country.csv.bz2', title='country data of Maddison Project Database 2023',
+    read_kwargs=dict(compression="bz2", thousands=','),
+    post=lambda df: df.sort_values(['countrycode', 'year']),
+    keys=('countrycode', 'country', 'region', 'year'),
+    definitions=mad_definitions))
+
+register(DatasetSpec(
+    'mad-region', 'mad_region.csv.bz2', title='regional data of Maddison Project Database 2023',
+    read_kwargs=dict(compression="bz2", thousands=','),
+    post=lambda df: df.sort_values(['region', 'year']),
+    keys=('region', 'year'), definitions=mad_definitions))
+
+register(DatasetSpec(
+    'pwt', 'pwt_data.csv.bz2', title='Penn World Table 11.0',
+    read_kwargs=dict(compression="bz2"), keys=_K3,
+    definitions_table=DatasetSpec('pwt-definitions', 'pwt_definitions.csv',
+                                  post=_pwt_definitions)))
+
+register(DatasetSpec(
+    'weo', 'weo.csv.bz2', title='IMF World Economic Outlook 2025',
+    read_kwargs=dict(compression="bz2"), keys=_K3,
+    definitions_table=DatasetSpec(
+        'weo-definitions', 'weo_description.csv.bz2',
+        read_kwargs=dict(compression="bz2"),
+        post=lambda df: df.set_index("WEO Subject Code").sort_index())))
+
+register(DatasetSpec(
+    'world-money', 'world_money.csv.bz2', title='177ヵ国のマネーストックなど',
+    read_kwargs=dict(compression="bz2"), keys=('iso', 'country', 'year'),
+    definitions=world_money_definitions))
+
+for _i in range(1, 6):
+    register(DatasetSpec(
+        f'data{_i}', f'data{_i}.csv', title='書籍「経済学のためのPython入門」用',
+        post=(lambda df: df.set_index('country')) if _i == 4 else None,
+        keys=('country',) if _i == 4 else ()))
+
+# 同梱のデータ・セット（`_columnar.py`の変換したファイルを使う）
+_BUILTIN = {name: _registry.get(name) for name in _registry.names()}
 
 
 # ===== Data-related function =================================================
 
 
-def data(dataset=None, description=0):
+def data(dataset=None, description=0, columns=None, countries=None, years=None,
+         compact=False):
     """|
        | 引数：
        |     datasets: (文字列)
@@ -645,6 +1213,7 @@ def data(dataset=None, description=0):
        |         'debts'：政府負債に関する長期時系列データ
        |         'dates': 景気循環日付と拡張・後退期間
        |         'ex': 円/ドル為替レートなど
+       |         'inequality': 所得・資産の分布とジニ係数
        |         'jpn-money': 日本の四半期データ（マネーストックなど）
        |         'jpn-q': 日本の四半期データ（GDPなど）
        |         'jpn-yr': 日本の年次データ（GDPなど）
@@ -658,6 +1227,7 @@ def data(dataset=None, description=0):
        |         'data3': 書籍「経済学のためのPython入門」用
        |         'data4': 書籍「経済学のためのPython入門」用
        |         'data5': 書籍「経済学のためのPython入門」用
+       |         * `register_dataset()`で登録したデータ・セット
        |
        |     description (デフォルト：0, 整数型):
        |         0: データのDataFrameを返す
@@ -667,6 +1237,28 @@ def data(dataset=None, description=0):
        |         2: 変数の定義のDataFrameを返す
        |            * `'pwt'`，`'weo'`のみ
        |
+       |     columns (デフォルト：None): 読み込む列名（文字列もしくはリスト）
+       |         * 国コードや年などの識別用の列は常に含まれる
+       |     countries (デフォルト：None): 国コード（文字列もしくはリスト）
+       |         * `countrycode`（`'world-money'`と`'bigmac'`は`iso`）の列で選択する
+       |     years (デフォルト：None): 年
+       |         * 整数：その年のみ
+       |         * (start, end)のタプル：startからendまで（両端を含む，Noneは上限・下限なし）
+       |         * リストなど：含まれる年のみ
+       |         * `year`の列もしくは`DatetimeIndex`で選択する
+       |
+       |     columns，countries，yearsはデータを読み込む際に適用されるため，
+       |     必要な部分のみがメモリに読み込まれる（description=0の場合のみ）。
+       |
+       |     compact (デフォルト：False): メモリを節約するデータ型を使う
+       |         False: `pd.read_csv()`のデータ型
+       |         True: 繰り返しが多い文字列の列（`country`など）はcategory型，
+       |               整数の列（`year`，`oecd`など）は最小のnullable整数型（Int8，Int16など）
+       |         'float32': Trueに加えて浮動小数点数の列をfloat32型にする
+       |         * データ型とcategory型のカテゴリーはデータ・セット全体で決まるため，
+       |           columns，countries，yearsで選択した行に依存しない
+       |         * `memory_report()`で節約されるメモリを確認できる
+       |
        | 返り値：
        |     DataFrame もしくは DataFrameの表示
        |
@@ -679,6 +1271,10 @@ def data(dataset=None, description=0):
        | 例３：py4macro.data('weo', description=2)
        |         -> IMF World Economic Outlookの変数定義のDataFrameを返す。
        |
+       | 例４：py4macro.data('pwt', columns=['rgdpna', 'pop', 'emp'],
+       |                     countries=['JPN', 'USA'], years=(1990, None))
+       |         -> 日本と米国の1990年以降の３つの変数（と識別用の列）を返す。
+       |
        |
        | ----- Penn World Tableについて -------------------------------------------
        |
@@ -709,312 +1305,274 @@ def data(dataset=None, description=0):
        |         North America
        |         South America"""
 
-    if dataset not in ['pwt', 'weo', 'mad', 'mad-region', 'jpn-q', 'jpn-yr',
-                       'jpn-money', 'world-money', 'ex', 'dates', 'bigmac', 'debts',
-                       'data1', 'data2', 'data3', 'data4', 'data5']:
+    spec = _registry.get(dataset)
+
+    if spec is None:
         try:
-            raise ValueError("""次の内１つを選んでください。
-    'bigmac': Big Macインデックス
-    'debts'：Historical Debts Data (Public Finances in Modern History)
-    'dates': 景気循環日付など
-    'ex': 円/ドル為替レートなど
-    'jpn-money': 日本の四半期データ（マネーストックなど）
-    'jpn-q': 日本の四半期データ（GDPなど）
-    'jpn-yr': 日本の年次データ（GDPなど）
-    'mad': country data of Maddison Project Database 2023
-    'mad-region': regional data of Maddison Project Database 2023
-    'pwt': Penn World Table 11.0
-    'weo': IMF World Economic Outlook 2025
-    'world-money': 177ヵ国のマネーストックなど
-    'data1': 書籍「経済学のためのPython入門」用
-    'data2': 書籍「経済学のためのPython入門」用
-    'data3': 書籍「経済学のためのPython入門」用
-    'data4': 書籍「経済学のためのPython入門」用
-    'data5': 書籍「経済学のためのPython入門」用""")
+            raise ValueError("次の内１つを選んでください。\n" + "\n".join(
+                f"    '{name}': {_registry.get(name).title}" for name in _registry.names()))
         except ValueError as e:
             print(e)
+        return
 
+    # 変数の定義がないデータ・セットはdescriptionに関わらずデータを返す
+    if (spec.descriptions is None) or (description == 0):
+        if compact not in (False, True, 'float32'):
+            raise ValueError("compactにはFalse，True，'float32'のいずれかを指定してください。")
+        return _read_csv(spec, _normalize_pushdown(columns, countries, years), compact)
 
-
-    # Penn World Table --------------------------------------------------------
-    if (dataset == 'pwt') & (description == 0):
-        full_file_path = _find_full_file_path(_get_path(__file__), 'pwt_data.csv.bz2')
-        return pd.read_csv(full_file_path, compression="bz2")
-
-    elif (dataset == 'pwt') & (description == 1):
-        full_file_path = _find_full_file_path(_get_path(__file__), 'pwt_definitions.csv')
-        df = pd.read_csv(full_file_path
-                        ).iloc[:, [0, 1]].dropna(subset=['Variable name']
-                                                  ).set_index('Variable name')
-        df.index.name = ''
-
-        with pd.option_context('display.max_colwidth', None,
-                               'display.max_rows', None):
-            display(df)
-
-    elif (dataset == 'pwt') & (description == 2):
-        full_file_path = _find_full_file_path(_get_path(__file__), 'pwt_definitions.csv')
-        df = pd.read_csv(full_file_path
-                        ).iloc[:, [0, 1]].dropna(subset=['Variable name']
-                                                  ).set_index('Variable name')
-        df.index.name = ''
-
-        return df
-
-    elif (dataset == 'pwt') & (description not in [0, 1, 2]):
+    elif description not in spec.descriptions:
         try:
-            raise ValueError("""descriptionに次の内１つを選んでください。
-    0: データのDataFrame (デフォルト)
-    1: 変数の定義を全て表示
-    2: 変数の定義のDataFrame""")
+            raise ValueError("descriptionに次の内１つを選んでください。\n" + "\n".join(
+                ["    0: データのDataFrame (デフォルト)",
+                 "    1: 変数の定義を全て表示",
+                 "    2: 変数の定義のDataFrame"][:len(spec.descriptions)]))
         except ValueError as e:
             print(e)
 
-    # IMF World Economic Outlook ----------------------------------------------
-    elif (dataset == 'weo') & (description == 0):
-        full_file_path = _find_full_file_path(_get_path(__file__), 'weo.csv.bz2')
-        return pd.read_csv(full_file_path, compression="bz2")
+    elif description == 2:
+        return _read_csv(spec.definitions_table)
 
-    elif (dataset == 'weo') & (description == 1):
-        full_file_path = _find_full_file_path(_get_path(__file__), 'weo_description.csv.bz2')
-        df = pd.read_csv(full_file_path,
-                         compression="bz2").set_index("WEO Subject Code").sort_index()
+    elif spec.definitions is not None:
+        print(spec.definitions)
 
+    else:
         with pd.option_context('display.max_colwidth', None,
                                'display.max_rows', None):
-            display(df)
-    
-    elif (dataset == 'weo') & (description == 2):
-        full_file_path = _find_full_file_path(_get_path(__file__), 'weo_description.csv.bz2')
-        df = pd.read_csv(full_file_path,
-                         compression="bz2").set_index("WEO Subject Code").sort_index()
-        return df
-
-    elif (dataset == 'weo') & (description not in [0, 1, 2]):
-        try:
-            raise ValueError("""descriptionに次の内１つを選んでください。
-    0: データのDataFrame (デフォルト)
-    1: 変数の定義を全て表示
-    2: 変数の定義のDataFrame""")
-        except ValueError as e:
-            print(e)
-
-    # Maddison Project (Countries) --------------------------------------------
-    elif (dataset == 'mad') & (description == 0):
-        full_file_path = _find_full_file_path(_get_path(__file__), 'mad_country.csv.bz2')
-        return pd.read_csv(full_file_path,
-                           compression="bz2", thousands=','
-                           ).sort_values(['countrycode', 'year'])
+            display(_read_csv(spec.definitions_table))
 
-    elif (dataset == 'mad') & (description == 1):
-        print(mad_definitions)
 
-    elif (dataset == 'mad') & (description not in [0, 1]):
-        try:
-            raise ValueError("""descriptionに次の内１つを選んでください。
-    0: データのDataFrame (デフォルト)
-    1: 変数の定義を全て表示""")
-        except ValueError as e:
-            print(e)
+def _stream(spec, pushdown, chunksize):
+    """
+    Chunks of at most `chunksize` rows of the dataset (rows filtered by `pushdown`).
 
-    # Maddison Project (regionsional data) ----------------------------------------------
-    elif (dataset == 'mad-region') & (description == 0):
-        full_file_path = _find_full_file_path(_get_path(__file__), 'mad_region.csv.bz2')
-        return pd.read_csv(full_file_path,
-                           compression="bz2", thousands=','
-                           ).sort_values(['region', 'year'])
+    return:
+        (iterator of DataFrames, function to apply to each yielded frame or None)
 
-    elif (dataset == 'mad-region') & (description == 1):
-        print(mad_definitions)
+    The chunks are sliced from the cached DataFrame if the full dataset is
+    already in the cache; otherwise they are parsed from the decompressing
+    CSV stream (`spec.post` has then yet to be applied)."""
 
-    elif (dataset == 'mad-region') & (description not in [0, 1]):
-        try:
-            raise ValueError("""descriptionに次の内１つを選んでください。
-    0: データのDataFrame
-    1: 変数の定義を表示""")
-        except ValueError as e:
-            print(e)
+    full_file_path, converted = _data_files(spec)
+    full = lookup((spec.name, spec.file), full_file_path if converted is None else converted)
 
-    # 日本の四半期データ（GDPなど）-------------------------------------------------------
-    elif (dataset == 'jpn-q') & (description == 0):
-        full_file_path = _find_full_file_path(_get_path(__file__), 'jpn_quarterly.csv.bz2')
-        df = pd.read_csv(full_file_path,
-                         index_col='index',
-                         parse_dates=True,
-                         compression="bz2")
-        df.index.name = ''
-        return df
+    if full is not None:
+        df = full if pushdown is None else _select(full, spec.keys, pushdown)
+        return (_cache._copy(df.iloc[i:i+chunksize]) for i in range(0, len(df), chunksize)), None
 
-    elif (dataset == 'jpn-q') & (description == 1):
-        print(jpn_q_definitions)
+    def chunks():
+        countries, years = (None, None) if pushdown is None else pushdown[1:]
+        read_kwargs = _csv_kwargs(spec, full_file_path, pushdown)
+        with pd.read_csv(full_file_path, chunksize=chunksize, **read_kwargs) as reader:
+            for chunk in reader:
+                if (countries is not None) or (years is not None):
+                    chunk = chunk.loc[_row_mask(chunk, countries, years)]
+                if len(chunk) > 0:
+                    yield chunk
 
-    elif (dataset == 'jpn-q') & (description not in [0, 1]):
-        try:
-            raise ValueError("""descriptionに次の内１つを選んでください。
-    0: データのDataFrame
-    1: 変数の定義を表示""")
-        except ValueError as e:
-            print(e)
+    return chunks(), spec.post
 
-    # 日本の年次データ（GDPなど）-------------------------------------------------------
-    elif (dataset == 'jpn-yr') & (description == 0):
-        full_file_path = _find_full_file_path(_get_path(__file__), 'jpn_annual.csv.bz2')
-        df = pd.read_csv(full_file_path,
-                         index_col='index',
-                         parse_dates=True,
-                         compression="bz2")
-        df.index.name = ''
-        return df
 
-    elif (dataset == 'jpn-yr') & (description == 1):
-        print(jpn_yr_definitions)
+def _iter_groups(chunks, post, by):
+    """
+    Yield (value, DataFrame) for each run of equal values of the column `by`.
+    The rows of the last group of a chunk are carried over to the next chunk."""
+
+    done = set()
+    pending = None
+
+    def emit(value, df):
+        if value in done:
+            raise ValueError(f"データが'{by}'の列で並んでいないため，byは使えません。"
+                             f"`data(dataset).groupby('{by}')`を使ってください。")
+        done.add(value)
+        return value, (df if post is None else post(df))
+
+    for chunk in chunks:
+        if by not in chunk.columns:
+            raise ValueError(f"'{by}'の列がありません。")
+        if pending is not None:
+            chunk = pd.concat([pending, chunk])
+
+        values = chunk[by].to_numpy()
+        starts = np.r_[0, np.flatnonzero(values[1:] != values[:-1]) + 1]
+        ends = np.r_[starts[1:], len(values)]
+        for start, end in zip(starts[:-1], ends[:-1]):
+            if not pd.isna(values[start]):
+                yield emit(values[start], chunk.iloc[start:end])
+        pending = chunk.iloc[starts[-1]:]
+
+    if (pending is not None) and (not pd.isna(pending[by].iloc[0])):
+        yield emit(pending[by].iloc[0], pending)
+
+
+def iter_data(dataset, by=None, chunksize=None, columns=None, countries=None, years=None):
+    """|
+       | データ・セットを国毎もしくは一定の行数毎に返すイテレーター
+       |
+       | 引数：
+       |     dataset: データ・セット名（`data()`と同じ）
+       |     by: 列名（例：'countrycode'）
+       |         * この列の値が同じ行（国など）毎に(値, DataFrame)を返す
+       |         * データはこの列の値毎にまとまっている必要がある
+       |           （'pwt'，'weo'，'mad'，'debts'，'world-money'などの国の列）
+       |     chunksize: 一度に読み込む行数
+       |         * `by=None`の場合は最大`chunksize`行のDataFrameを返す
+       |         * `by`を使う場合のデフォルトは1000
+       |     columns，countries，years: `data()`と同じ
+       |
+       | 戻り値：
+       |     イテレーター（ジェネレーター）
+       |
+       | データ・セット全体を読み込まず，bz2を解凍しながら`chunksize`行ずつ読み込む。
+       | そのため，メモリの使用量は`chunksize`行と１つの国の行数で決まる。
+       | データ・セット全体が既にキャッシュにある場合はそれを分割して返す。
+       | 後処理（並べ替えなど）は返すDataFrame毎に行われる。
+       |
+       | 例１：for code, df in py4macro.iter_data('pwt', by='countrycode'):
+       |           ...
+       |
+       | 例２：for df in py4macro.iter_data('debts', chunksize=5000):
+       |           ..."""
 
-    elif (dataset == 'jpn-yr') & (description not in [0, 1]):
-        try:
-            raise ValueError("""descriptionに次の内１つを選んでください。
-    0: データのDataFrame
-    1: 変数の定義を表示""")
-        except ValueError as e:
-            print(e)
+    spec = _registry.get(dataset)
+    if spec is None:
+        raise ValueError(f"'{dataset}'はありません。次の内から選んでください：{_registry.names()}")
+    if (by is None) and (chunksize is None):
+        raise ValueError("byもしくはchunksizeを指定してください。")
+    if (chunksize is not None) and (int(chunksize) < 1):
+        raise ValueError("chunksizeには1以上の整数を指定してください。")
 
-    # 日本の四半期データ（マネーストックなど）-----------------------------------------
-    elif (dataset == 'jpn-money') & (description == 0):
-        full_file_path = _find_full_file_path(_get_path(__file__), 'jpn_money.csv.bz2')
-        df = pd.read_csv(full_file_path,
-                         index_col='date', parse_dates=True, compression="bz2")
-        df.index.name = ''
-        return df
+    pushdown = _normalize_pushdown(columns, countries, years)
+    chunks, post = _stream(spec, pushdown, 1000 if chunksize is None else int(chunksize))
 
-    elif (dataset == 'jpn-money') & (description == 1):
-        print(jpn_money_definitions)
+    if by is not None:
+        return _iter_groups(chunks, post, by)
+    return chunks if post is None else map(post, chunks)
 
-    elif (dataset == 'jpn-money') & (description not in [0, 1]):
-        try:
-            raise ValueError("""descriptionに次の内１つを選んでください。
-    0: データのDataFrame
-    1: 変数の定義を表示""")
-        except ValueError as e:
-            print(e)
 
-    # 177ヵ国のマネーストックなど -----------------------------------------------------
-    elif (dataset == 'world-money') & (description == 0):
-        full_file_path = _find_full_file_path(_get_path(__file__), 'world_money.csv.bz2')
-        df = pd.read_csv(full_file_path,
-                         compression="bz2")
-        return df
-
-    elif (dataset == 'world-money') & (description == 1):
-        print(world_money_definitions)
-
-    elif (dataset == 'world-money') & (description not in [0, 1]):
-        try:
-            raise ValueError("""descriptionに次の内１つを選んでください。
-    0: データのDataFrame
-    1: 変数の定義を表示""")
-        except ValueError as e:
-            print(e)
-
-    # 円/ドル為替レートなど -----------------------------------------------------
-    elif (dataset == 'ex') & (description == 0):
-        full_file_path = _find_full_file_path(_get_path(__file__), 'real_ex_rate.csv.bz2')
-        df = pd.read_csv(full_file_path,
-                         index_col='index',
-                         parse_dates=True,
-                         compression="bz2")
-        df.index.name = ''
-        return df
+def panel(dataset, columns=None, compact=False):
+    """|
+       | 国と年のパネル・データを(国コード, 年)で索引したオブジェクトを返す
+       |
+       | 引数：
+       |     dataset: データ・セット名（'pwt'，'weo'，'mad'，'debts'，'world-money'）もしくはDataFrame
+       |         * DataFrameの場合は`countrycode`（もしくは`iso`）と`year`の列が必要
+       |     columns: 読み込む列名（`data()`と同じ）
+       |     compact: `data()`と同じ
+       |
+       | 戻り値：
+       |     Panelオブジェクト
+       |         select(countries=None, years=None, **groups): 行を選択したDataFrame
+       |         wide(column, countries=None, years=None, **groups): 国 x 年のDataFrame
+       |         members(column): 列の値 -> 国コードのリストの辞書
+       |         frame: (国コード, 年)のMultiIndexで並べ替えたDataFrame
+       |
+       | 行は最初に一度だけ並べ替えられ，国の位置と年の範囲は二分探索で求められる。
+       | そのため，同じPanelオブジェクトで選択を繰り返す場合は，
+       | `df.loc[(df['countrycode']=='JPN') & (df['year']>=1990)]`のように
+       | 全ての行を比較するよりも速い。
+       | `groups`には`income_group`，`region`，`continent`など国毎に一定の列を使える。
+       |
+       | 例：pwt = py4macro.panel('pwt')
+       |     pwt.select('JPN', years=(1990, None))
+       |     pwt.select(['JPN', 'USA'], years=2019)
+       |     pwt.select(years=(2000, 2019), income_group='High income')
+       |     pwt.wide('rgdpna', continent='Asia', years=(1990, 2019))"""
+
+    if isinstance(dataset, pd.DataFrame):
+        df = dataset
+    elif _registry.get(dataset) is None:
+        raise ValueError(f"'{dataset}'はありません。次の内から選んでください：{_registry.names()}")
+    else:
+        df = data(dataset, columns=columns, compact=compact)
 
-    elif (dataset == 'ex') & (description == 1):
-        print(ex_definitions)
+    return _panel.Panel(df, country=_country_column(df.columns))
 
-    elif (dataset == 'ex') & (description not in [0, 1]):
-        try:
-            raise ValueError("""descriptionに次の内１つを選んでください。
-    0: データのDataFrame
-    1: 変数の定義を表示""")
-        except ValueError as e:
-            print(e)
 
-    # 景気循環日付など -----------------------------------------------------
-    elif (dataset == 'dates') & (description == 0):
-        full_file_path = _find_full_file_path(_get_path(__file__), 'cycle_dates.csv.bz2')
-        df = pd.read_csv(full_file_path,
-                         index_col='index',
-                         parse_dates=['tani1','yama','tani2'],
-                         compression="bz2",
-                         dtype={'expansion': 'Int64', 'contraction': 'Int64'})
-        df.index.name = ''
-        return df
+def data_many(datasets, max_workers=None, **kwargs):
+    """|
+       | 複数のデータ・セットをスレッド・プールで同時に読み込む
+       |
+       | 引数：
+       |     datasets: データ・セット名のリスト（例：['pwt', 'weo', 'mad', 'debts']）
+       |     max_workers: スレッドの数（デフォルト：None，データ・セットの数とCPUの数から決まる）
+       |     kwargs: 全てのデータ・セットの`data()`に渡す引数（columns，countries，years，compact）
+       |
+       | 戻り値：
+       |     データ・セット名をキー，DataFrameを値とする辞書（`datasets`の順番）
+       |
+       | bz2の解凍とCSVの解析の多くはGILを解放するため，複数のデータ・セットを並行して読み込める。
+       | 同じデータ・セットを複数のスレッドが同時に要求した場合，ファイルの読み込みは１回だけ行われる。
+       |
+       | 例：dfs = py4macro.data_many(['pwt', 'weo', 'mad', 'debts'])
+       |     pwt = dfs['pwt']"""
 
-    elif (dataset == 'dates') & (description == 1):
-        print(dates_definitions)
+    from concurrent.futures import ThreadPoolExecutor
 
-    elif (dataset == 'dates') & (description not in [0, 1]):
-        try:
-            raise ValueError("""descriptionに次の内１つを選んでください。
-    0: データのDataFrame
-    1: 変数の定義を表示""")
-        except ValueError as e:
-            print(e)
+    names = list(dict.fromkeys(datasets))
+    unknown = [name for name in names if _registry.get(name) is None]
+    if unknown:
+        raise ValueError(f"次のデータ・セットはありません：{unknown}\n"
+                         f"次の内から選んでください：{_registry.names()}")
 
-    # Big Mac Index -----------------------------------------------------
-    elif (dataset == 'bigmac') & (description == 0):
-        full_file_path = _find_full_file_path(_get_path(__file__), 'bigmac.csv.bz2')
-        df = pd.read_csv(full_file_path,
-                         index_col='index',
-                         compression="bz2",
-                         dtype={'expansion': 'Int64', 'contraction': 'Int64'})
-        df.index.name = ''
-        return df
+    if max_workers is None:
+        max_workers = min(len(names), (os.cpu_count() or 1) + 4) or 1
 
-    elif (dataset == 'bigmac') & (description == 1):
-        print(bigmac_definitions)
+    with ThreadPoolExecutor(max_workers) as executor:
+        futures = {name: executor.submit(data, name, **kwargs) for name in names}
+        return {name: future.result() for name, future in futures.items()}
 
-    elif (dataset == 'bigmac') & (description not in [0, 1]):
-        try:
-            raise ValueError("""descriptionに次の内１つを選んでください。
-    0: データのDataFrame
-    1: 変数の定義を表示""")
-        except ValueError as e:
-            print(e)
 
-    # Historical Delts --------------------------------------------------------
-    elif (dataset == 'debts') & (description == 0):
-        full_file_path = _find_full_file_path(_get_path(__file__), 'debts.csv.bz2')
-        return pd.read_csv(full_file_path, compression="bz2")
+async def adata(dataset, **kwargs):
+    """|
+       | `data()`のasyncio版（スレッド・プールで読み込む）
+       |
+       | 引数：`data()`と同じ
+       |
+       | 戻り値：`data()`と同じ
+       |
+       | 同じデータ・セットを同時に要求した場合，ファイルの読み込みは１回だけ行われる。
+       |
+       | 例：pwt = await py4macro.adata('pwt')
+       |
+       |     pwt, weo = await asyncio.gather(py4macro.adata('pwt'), py4macro.adata('weo'))"""
 
-    elif (dataset == 'debts') & (description == 1):
-        print(debts_definitions)
+    import asyncio
 
-    elif (dataset == 'debts') & (description not in [0, 1]):
-        try:
-            raise ValueError("""descriptionに次の内１つを選んでください。
-    0: データのDataFrame (デフォルト)
-    1: 変数の定義を全て表示""")
-        except ValueError as e:
-            print(e)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(data, dataset, **kwargs))
 
-    # 書籍「経済学のためのPython入門」 --------------------------------------------
-    elif (dataset == 'data1'):
-        full_file_path = _find_full_file_path(_get_path(__file__), 'data1.csv')
-        return pd.read_csv(full_file_path)
 
-    elif (dataset == 'data2'):
-        full_file_path = _find_full_file_path(_get_path(__file__), 'data2.csv')
-        return pd.read_csv(full_file_path)
+def memory_report(datasets=None, compact=True):
+    """|
+       | `data(compact=...)`で節約されるメモリを表示する
+       |
+       | 引数：
+       |     datasets: データ・セット名のリスト（デフォルト：None，全てのデータ・セット）
+       |     compact: `data()`の引数compact（True もしくは 'float32'，デフォルト：True）
+       |
+       | 戻り値：
+       |     データ・セット毎のメモリ使用量（MB）のDataFrame
+       |         original: compact=Falseの場合
+       |         compact: compactを使った場合
+       |         saved: 節約されたメモリ
+       |         saved (%): 節約されたメモリの割合
+       |
+       | 例：py4macro.memory_report(['pwt', 'weo'])"""
 
-    elif (dataset == 'data3'):
-        full_file_path = _find_full_file_path(_get_path(__file__), 'data3.csv')
-        return pd.read_csv(full_file_path)
+    if datasets is None:
+        datasets = _registry.names()
 
-    elif (dataset == 'data4'):
-        full_file_path = _find_full_file_path(_get_path(__file__), 'data4.csv')
-        return pd.read_csv(full_file_path).set_index('country')
+    rows = {}
+    for name in datasets:
+        original = data(name)
+        small = data(name, compact=compact)
+        rows[name] = [original.memory_usage(deep=True).sum() / 1024**2,
+                      small.memory_usage(deep=True).sum() / 1024**2]
 
-    elif (dataset == 'data5'):
-        full_file_path = _find_full_file_path(_get_path(__file__), 'data5.csv')
-        return pd.read_csv(full_file_path)
+    df = pd.DataFrame.from_dict(rows, orient='index', columns=['original', 'compact'])
+    df['saved'] = df['original'] - df['compact']
+    df['saved (%)'] = 100 * df['saved'] / df['original']
 
-    # Otherwise ---------------------------------------------------------------
-    else:
-        pass
+    return df
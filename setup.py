@@ -1,5 +1,35 @@
 import glob
+import importlib.util
+import os
+import sys
 from setuptools import find_packages, setup
+from setuptools.command.build_py import build_py
+
+
+class BuildPyWithManifest(build_py):
+    """
+    Regenerate `py4macro/data/manifest.json` (paths, sizes, checksums, dtypes) and
+    add the Feather (zstd) versions of the datasets when building."""
+
+    def run(self):
+        super().run()
+        spec = importlib.util.spec_from_file_location('_manifest', './py4macro/_manifest.py')
+        manifest = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(manifest)
+        out_dir = os.path.join(self.build_lib, 'py4macro', 'data')
+        self.mkpath(out_dir)
+        manifest.write_manifest(data_dir='./py4macro/data', out_dir=out_dir)
+        self.convert_data(out_dir)
+
+    def convert_data(self, out_dir):
+        """Write the Feather files (needs pandas and pyarrow, otherwise only the CSV files are used)."""
+
+        if (importlib.util.find_spec('pandas') is None) or (importlib.util.find_spec('pyarrow') is None):
+            print('pandas or pyarrow is not installed: skipping the Feather versions of the datasets')
+            return
+        sys.path.insert(0, os.path.abspath('.'))
+        from py4macro import _columnar
+        _columnar.build(out_dir)
 
 
 additional_files = []
@@ -12,11 +42,12 @@ setup(
     version='0.8.16',
     author='Tetsu Haruyama',
     author_email='haruyama@econ.kobe-u.ac.jp',
-    packages=find_packages(exclude=("data_generation",)),
+    packages=find_packages(exclude=("data_generation", "benchmarks", "benchmarks.*")),
     package_dir={'py4macro': './py4macro'},
     include_package_data=True,
     package_data={'py4macro': additional_files},
     install_requires=['pandas'],
+    cmdclass={'build_py': BuildPyWithManifest},
     url='https://github.com/Py4Macro/py4macro',
     license='MIT',
     description='A module for py4macro.github.io',
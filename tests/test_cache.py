@@ -0,0 +1,31 @@
+"""`data()`のキャッシュ"""
+
+import os
+
+import pytest
+
+import py4macro
+from py4macro import _cache
+
+
+@pytest.fixture
+def settings():
+    saved = dict(_cache._settings)
+    yield _cache._settings
+    _cache._settings.update(saved)
+    py4macro.cache_clear()
+
+
+def test_cache_clear_keeps_other_files(tmp_path, settings):
+    pytest.importorskip('pyarrow')
+    settings.update(disk=True, directory=str(tmp_path), shared=False)
+    other = ['results.parquet', 'pwt.parquet', 'notes-0123456789abcdef.arrow']
+    for f in other:
+        (tmp_path / f).write_bytes(b'')
+
+    py4macro.data('jpn-q')
+    snapshots = [f for f in os.listdir(tmp_path) if f not in other]
+    assert len(snapshots) == 1
+
+    py4macro.cache_clear(disk=True)
+    assert sorted(os.listdir(tmp_path)) == sorted(other)
@@ -0,0 +1,51 @@
+"""同梱データのFeatherファイルとCSVファイルから読み込んだDataFrameが一致するか"""
+
+import os
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('pyarrow')
+
+from py4macro import _columnar, py4macro  # noqa: E402
+
+_CONVERTED = [name for name, spec in py4macro._BUILTIN.items()
+              if _columnar.path_for(py4macro._data_files(spec)[0]) != py4macro._data_files(spec)[0]]
+
+
+def _assert_same(df, csv):
+    pd.testing.assert_frame_equal(df, csv, check_exact=True, check_index_type=True,
+                                  check_column_type=True)
+
+
+@pytest.mark.parametrize('name', _CONVERTED)
+def test_roundtrip(name, tmp_path):
+    # 現在のpandasで変換したファイルを読み込む（日時の単位や文字列のデータ型も比較する）
+    spec = py4macro._BUILTIN[name]
+    csv_path = py4macro._data_files(spec)[0]
+    csv = py4macro._parse_csv(spec, csv_path)
+    path = os.path.join(tmp_path, os.path.basename(_columnar.path_for(csv_path)))
+    _columnar.write(csv, path, csv_path)
+    _assert_same(_columnar.read(path), csv)
+
+
+@pytest.mark.parametrize('name', _CONVERTED)
+def test_installed_file(name):
+    # パッケージに含まれる（data()が使う）ファイル
+    spec = py4macro._BUILTIN[name]
+    csv_path, converted = py4macro._data_files(spec)
+    if converted is None:
+        pytest.skip('no usable Feather file for this dataset')
+    _assert_same(_columnar.read(converted), py4macro._parse_csv(spec, csv_path))
+
+
+def test_other_pandas_version_is_not_used(tmp_path, monkeypatch):
+    spec = py4macro._BUILTIN['jpn-q']
+    csv_path = py4macro._data_files(spec)[0]
+    path = os.path.join(tmp_path, 'jpn_quarterly.feather')
+    monkeypatch.setattr(_columnar, '_pandas_major', lambda: '0')
+    _columnar.write(py4macro._parse_csv(spec, csv_path), path, csv_path)
+    monkeypatch.undo()
+    st = os.stat(csv_path)
+    assert not _columnar._matches(path, os.stat(path).st_mtime_ns, csv_path,
+                                  st.st_size, st.st_mtime_ns)
@@ -0,0 +1,30 @@
+"""内蔵のHPフィルターと`statsmodels`の`hpfilter()`の比較"""
+
+import numpy as np
+import pytest
+
+from py4macro import _hp
+
+hpfilter = pytest.importorskip('statsmodels.tsa.filters.hp_filter').hpfilter
+
+ENGINES = ['numpy', pytest.param('scipy', marks=pytest.mark.skipif(
+    _hp._default_engine() != 'scipy', reason='scipy is not installed'))]
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('n, lamb', [(3, 1600), (4, 1600), (50, 100), (500, 1600),
+                                     (5_000, 129_600)])
+def test_matches_statsmodels(engine, n, lamb):
+    y = np.random.default_rng(n).standard_normal(n).cumsum()
+    expected = hpfilter(y, lamb=lamb)[1]
+    np.testing.assert_allclose(_hp.hp_trend(y, lamb, engine), expected,
+                               rtol=1e-9, atol=1e-9 * np.abs(y).max())
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_columns_match_single_series(engine):
+    y = np.random.default_rng(0).standard_normal((200, 3)).cumsum(axis=0)
+    trends = _hp.hp_trend(y, 1600, engine)
+    for j in range(y.shape[1]):
+        np.testing.assert_allclose(trends[:, j], hpfilter(y[:, j], lamb=1600)[1],
+                                   rtol=1e-9, atol=1e-9 * np.abs(y).max())
@@ -0,0 +1,18 @@
+"""`data/manifest.json`の作成"""
+
+import json
+
+from py4macro import _manifest
+
+
+def test_dtypes_kept_without_pandas(tmp_path, monkeypatch):
+    # pandasがない場合（_describe()がdtypesを返さない場合）は既存のdtypesを使う
+    monkeypatch.setattr(_manifest, '_describe', lambda path: (0, None))
+    out = _manifest.write_manifest(out_dir=str(tmp_path))
+    with open(out, encoding='utf-8') as f:
+        files = json.load(f)['files']
+
+    existing = _manifest._read_existing(_manifest.DATA_DIR)
+    for name, entry in files.items():
+        if 'dtypes' in entry:
+            assert entry['dtypes'] == existing[name]['dtypes'] is not None, name
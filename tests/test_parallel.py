@@ -0,0 +1,27 @@
+"""プロセス・プールを使ったパネル・データのHPフィルター（`n_jobs`）"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import py4macro
+from py4macro import _parallel
+
+
+@pytest.fixture(scope='module')
+def pwt():
+    return py4macro.data('pwt')
+
+
+@pytest.mark.parametrize('onesided', [False, True])
+def test_identical_to_serial(pwt, onesided):
+    serial = py4macro.trend(pwt, lamb=100, by='countrycode', n_jobs=1, onesided=onesided)
+    parallel = py4macro.trend(pwt, lamb=100, by='countrycode', n_jobs=2, onesided=onesided)
+    pd.testing.assert_frame_equal(serial, parallel, check_exact=True)
+
+
+def test_partition_keeps_all_groups():
+    positions = [np.arange(i, i + k) for i, k in enumerate([5, 1, 30, 2, 2, 40])]
+    flat = [p for chunk in _parallel.partition(positions, 3) for p in chunk]
+    assert len(flat) == len(positions)
+    assert all(a is b for a, b in zip(flat, positions))